@@ -17,7 +17,6 @@
     python cli.py --rotate 30 "URL"
 """
 
-import argparse
 import sys
 
 if __package__ in (None, ""):
@@ -37,7 +36,17 @@ from ting13.core.download import DownloadEngine, DownloadCallbacks
 from ting13.sources import find_source, get_source_names
 
 
-def main():
+def _parse_args():
+    # 最常见的用法只传一个 URL — 这条路不 import argparse
+    # 也不构建带长 epilog 的解析器, 省下冷启动的解析器搭建开销
+    if len(sys.argv) == 2 and sys.argv[1].startswith(("http://", "https://")):
+        from types import SimpleNamespace
+        return SimpleNamespace(
+            url=sys.argv[1], output=".", start=1, end=None,
+            no_headless=False, proxy=None, rotate=0,
+        )
+
+    import argparse
     parser = argparse.ArgumentParser(
         description="有声小说下载器 (插件化架构)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -71,7 +80,11 @@ def main():
     parser.add_argument("--rotate", type=int, default=0,
                         help="通过 Clash API 每 N 集自动换 IP")
 
-    args = parser.parse_args()
+    return parser.parse_args()
+
+
+def main():
+    args = _parse_args()
 
     # ── 识别站点 ──
     source = find_source(args.url)
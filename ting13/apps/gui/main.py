@@ -12,8 +12,10 @@
 
 import os
 import sys
-import queue
 import threading
+import time
+import queue
+from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Optional, Dict
 
 if __package__ in (None, ""):
@@ -36,7 +38,6 @@ from ting13.core.network import (
     set_proxy, get_proxy, detect_system_proxy,
     is_dns_poisoned, resolve_via_doh, ClashRotator,
 )
-from ting13.core.download import DownloadEngine, DownloadCallbacks
 from ting13.core.utils import is_frozen, get_bundled_base
 
 # ── Source 插件系统 ──
@@ -45,32 +46,49 @@ from ting13.sources.base import Source
 
 # ── ting13 登录支持 ──
 from ting13.sources.ting13 import (
-    save_cookies, load_cookies, clear_cookies, has_cookies,
+    Ting13Source, save_cookies, load_cookies, clear_cookies, has_cookies,
 )
 
-try:
-    from playwright.sync_api import sync_playwright
-except ImportError:
-    pass
-
+# 启动路径上的常量只算一次 (exe 下 expanduser 要走 Win32 API)
+_SITES = " / ".join(get_source_names())
+_DEFAULT_DOWNLOADS = os.path.join(os.path.expanduser("~"), "Downloads")
 
 # ══════════════════════════════════════════════════════════════
 # 日志重定向
 # ══════════════════════════════════════════════════════════════
 
 class QueueWriter:
-    """将 print() 输出转发到 queue, 供 GUI 线程读取"""
+    """将 print() 输出转发到 queue, 供 GUI 线程读取
+
+    小段输出先在本地缓冲, 凑满一行 (或超过 4KB) 再入队,
+    避免日志密集时每个 print 片段都触发一次队列操作和 Tk 刷新。
+    """
+
+    # 缓冲上限 (字节), 超过即强制入队
+    FLUSH_THRESHOLD = 4096
 
-    def __init__(self, log_queue: queue.Queue):
+    def __init__(self, log_queue: queue.SimpleQueue):
         self._queue = log_queue
+        self._buf: list = []
+        self._buf_len = 0
         self.encoding = "utf-8"
 
     def write(self, text: str):
-        if text and text.strip():
-            self._queue.put(("log", text.rstrip("\n")))
+        if not text:
+            return
+        self._buf.append(text)
+        self._buf_len += len(text)
+        if "\n" in text or self._buf_len >= self.FLUSH_THRESHOLD:
+            self.flush()
 
     def flush(self):
-        pass
+        if not self._buf:
+            return
+        merged = "".join(self._buf)
+        self._buf = []
+        self._buf_len = 0
+        if merged.strip():
+            self._queue.put(("log", merged.rstrip("\n")))
 
 
 # ══════════════════════════════════════════════════════════════
@@ -84,6 +102,7 @@ class App(ctk.CTk):
     VERSION = "v3.0"
     WINDOW_WIDTH = 820
     WINDOW_HEIGHT = 720
+    LOG_MAX_LINES = 5000  # 日志控件保留的最大行数
 
     def __init__(self):
         super().__init__()
@@ -99,13 +118,38 @@ class App(ctk.CTk):
         self._book_info: Optional[BookInfo] = None
         self._is_downloading = False
         self._stop_requested = False
-        self._worker_thread: Optional[threading.Thread] = None
-        self._msg_queue: queue.Queue = queue.Queue()
+        # 配合 _stop_requested: 引擎的防限流 sleep 在 wait 此事件, 停止时立即醒
+        self._stop_event = threading.Event()
+        # 复用线程池, 避免每次点击都创建新线程; Future 句柄用于协作取消
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ting13")
+        self._future: Optional[Future] = None
+        # SimpleQueue: C 实现的无锁 FIFO, 单生产单消费场景比 queue.Queue 快
+        self._msg_queue: queue.SimpleQueue = queue.SimpleQueue()
         self._clash_rotator: Optional[ClashRotator] = None
+        self._buttons_working = False  # 上次已应用的按钮状态 (跳过重复更新)
+        # 进度消息限流 (生产端): 上次入队的时间和值
+        self._last_prog_t = 0.0
+        self._last_prog_v = -1.0
+        # 上次入队的 status/info 文本 (相同值直接丢弃, 不走队列)
+        self._last_sent = {"status": None, "info": None}
+
+        # print() 输出统一走消息队列 — 只在这里重定向一次。
+        # 以前是每个 worker 各自换一遍 sys.stdout 再还原,
+        # 两个任务重叠时会互相覆盖, 且全局可变状态不线程安全。
+        sys.stdout = QueueWriter(self._msg_queue)
 
         # ── 构建 UI ──
         self._build_ui()
+        # 随按钮状态一起启停的控件, 列表只建一次 (而不是每次切换时临时拼)
+        self._main_widgets = [
+            self.parse_btn, self.download_btn, self.url_entry,
+            self.output_entry, self.browse_btn, self.proxy_entry,
+            self.proxy_detect_btn, self.rotate_check,
+            self.rotate_interval_entry, self.paste_btn,
+            self.login_btn,
+        ]
         self._poll_queue()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
     # ══════════════════════════════════════════════════════════
     # UI 构建
@@ -127,10 +171,9 @@ class App(ctk.CTk):
             font=ctk.CTkFont(size=22, weight="bold"),
         ).grid(row=0, column=0, sticky="w")
 
-        sites = " / ".join(get_source_names())
         ctk.CTkLabel(
             title_frame,
-            text=f"{self.VERSION}  ({sites})",
+            text=f"{self.VERSION}  ({_SITES})",
             font=ctk.CTkFont(size=12), text_color="gray",
         ).grid(row=0, column=1, sticky="e")
 
@@ -143,7 +186,7 @@ class App(ctk.CTk):
         ctk.CTkLabel(input_frame, text="书籍 URL:", width=80, anchor="e").grid(
             row=0, column=0, padx=(12, 4), pady=10)
         self.url_entry = ctk.CTkEntry(
-            input_frame, placeholder_text=f"支持: {sites}")
+            input_frame, placeholder_text=f"支持: {_SITES}")
         self.url_entry.grid(row=0, column=1, sticky="ew", padx=4, pady=10)
 
         self.paste_btn = ctk.CTkButton(
@@ -155,7 +198,7 @@ class App(ctk.CTk):
             row=1, column=0, padx=(12, 4), pady=(0, 10))
         self.output_entry = ctk.CTkEntry(input_frame)
         self.output_entry.grid(row=1, column=1, sticky="ew", padx=4, pady=(0, 10))
-        self.output_entry.insert(0, os.path.join(os.path.expanduser("~"), "Downloads"))
+        self.output_entry.insert(0, _DEFAULT_DOWNLOADS)
 
         self.browse_btn = ctk.CTkButton(
             input_frame, text="浏览...", width=60, command=self._browse_output)
@@ -299,53 +342,119 @@ class App(ctk.CTk):
         self._msg_queue.put(("log", msg))
 
     def _set_status(self, text: str):
+        # 相同文本重复推送 (如每章一次的"下载中...") 直接丢弃
+        if text == self._last_sent["status"]:
+            return
+        self._last_sent["status"] = text
         self._msg_queue.put(("status", text))
 
     def _set_info(self, text: str):
+        if text == self._last_sent["info"]:
+            return
+        self._last_sent["info"] = text
         self._msg_queue.put(("info", text))
 
     def _set_progress(self, value: float, label: str = ""):
+        # 生产端限流: 大书下载时每个分块都会回调一次,
+        # 33ms 内且变化不足 0.5% 的纯数值更新直接丢弃, 队列不会被刷爆
+        now = time.monotonic()
+        if (label == "" and now - self._last_prog_t < 0.033
+                and abs(value - self._last_prog_v) < 0.005):
+            return
+        self._last_prog_t = now
+        self._last_prog_v = value
         self._msg_queue.put(("progress", value, label))
 
     def _set_buttons(self, working: bool):
         self._msg_queue.put(("buttons", working))
 
     def _poll_queue(self):
+        # 先批量取出本轮所有消息 (限流 500 条/轮, 防止饿死 Tk 事件循环)
+        messages = []
         try:
-            while True:
-                msg = self._msg_queue.get_nowait()
-                kind = msg[0]
+            for _ in range(500):
+                messages.append(self._msg_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        if messages:
+            # 同类消息合并: 日志拼成一大块一次性插入,
+            # status/info/progress/buttons 只应用最后一条 (旧值已过时)
+            log_parts = []
+            last_status = last_info = last_progress = last_buttons = None
+            update_login = False
+            misc = []  # 低频消息 (代理探测结果等), 按原顺序处理
 
+            for msg in messages:
+                kind = msg[0]
                 if kind == "log":
-                    self.log_text.configure(state="normal")
-                    self.log_text.insert("end", msg[1] + "\n")
-                    self.log_text.see("end")
-                    self.log_text.configure(state="disabled")
+                    log_parts.append(msg[1])
                 elif kind == "status":
-                    self.status_label.configure(text=msg[1])
+                    last_status = msg
                 elif kind == "info":
-                    self.info_label.configure(text=msg[1])
+                    last_info = msg
                 elif kind == "progress":
-                    self.progress_bar.set(msg[1])
-                    label = msg[2] if len(msg) > 2 else ""
-                    self.progress_label.configure(
-                        text=label if label else f"{msg[1] * 100:.0f}%")
+                    last_progress = msg
                 elif kind == "buttons":
-                    working = msg[1]
-                    state_main = "disabled" if working else "normal"
-                    state_stop = "normal" if working else "disabled"
-                    for w in [self.parse_btn, self.download_btn, self.url_entry,
-                              self.output_entry, self.browse_btn, self.proxy_entry,
-                              self.proxy_detect_btn, self.rotate_check,
-                              self.rotate_interval_entry, self.paste_btn,
-                              self.login_btn]:
-                        w.configure(state=state_main)
-                    self.stop_btn.configure(state=state_stop)
+                    last_buttons = msg
                 elif kind == "update_login":
-                    self._update_login_status()
-        except queue.Empty:
-            pass
-        self.after(80, self._poll_queue)
+                    update_login = True
+                else:
+                    misc.append(msg)
+
+            if log_parts:
+                self.log_text.configure(state="normal")
+                self.log_text.insert("end", "\n".join(log_parts) + "\n")
+                # 环形缓冲: 日志超过上限就从头部截掉,
+                # 长时间下载时控件内存和重绘开销都有界
+                try:
+                    lines = int(self.log_text.index("end-1c").split(".")[0])
+                    if lines > self.LOG_MAX_LINES:
+                        self.log_text.delete(
+                            "1.0", f"{lines - self.LOG_MAX_LINES + 1}.0")
+                except Exception:
+                    pass
+                self.log_text.see("end")
+                self.log_text.configure(state="disabled")
+            if last_status:
+                self.status_label.configure(text=last_status[1])
+            if last_info:
+                self.info_label.configure(text=last_info[1])
+            if last_progress:
+                self.progress_bar.set(last_progress[1])
+                label = last_progress[2] if len(last_progress) > 2 else ""
+                self.progress_label.configure(
+                    text=label if label else f"{last_progress[1] * 100:.0f}%")
+            if last_buttons is not None:
+                self._set_buttons_impl(last_buttons[1])
+            if update_login:
+                self._update_login_status()
+            for msg in misc:
+                kind = msg[0]
+                if kind == "proxy_detected":
+                    self.proxy_entry.delete(0, "end")
+                    self.proxy_entry.insert(0, msg[1])
+                elif kind == "msgbox_info":
+                    messagebox.showinfo(msg[1], msg[2])
+                elif kind == "clash_status":
+                    self.clash_status_label.configure(
+                        text=msg[1], text_color=msg[2])
+                    if msg[3]:
+                        self._rotate_var.set(True)
+
+        # 自适应轮询间隔: 忙时 40ms 保持流畅, 空闲时降到 250ms 省 CPU
+        next_ms = 40 if messages or self._is_downloading else 250
+        self.after(next_ms, self._poll_queue)
+
+    def _set_buttons_impl(self, working: bool):
+        """实际应用按钮状态 (仅主线程调用); 状态未变时跳过全部 Tcl 调用"""
+        if working == self._buttons_working:
+            return
+        self._buttons_working = working
+        state_main = "disabled" if working else "normal"
+        for w in self._main_widgets:
+            w.configure(state=state_main)
+        self.stop_btn.configure(state="normal" if working else "disabled")
 
     def _get_url(self) -> str:
         return self.url_entry.get().strip()
@@ -394,7 +503,7 @@ class App(ctk.CTk):
         try:
             rotator = ClashRotator()
             if rotator.auto_detect():
-                nodes = rotator.load_nodes()
+                nodes = rotator.load_nodes_cached()
                 if nodes:
                     self._clash_rotator = rotator
                     self._log(f"[*] Clash API 就绪: {rotator.group_name} ({len(nodes)} 个节点)")
@@ -402,42 +511,52 @@ class App(ctk.CTk):
             pass
 
     def _on_detect_proxy(self):
-        self._log("[*] 正在检测系统代理...")
-        detected = detect_system_proxy()
-        if detected:
-            self.proxy_entry.delete(0, "end")
-            self.proxy_entry.insert(0, detected)
-            self._log(f"[OK] 检测到代理: {detected}")
-        else:
-            self._log("[!] 未检测到系统代理")
-            messagebox.showinfo("提示", "未检测到系统代理。\n请确认 Clash Verge 已开启「系统代理」。")
-            return
+        # 三项探测 (系统代理 / DNS / Clash API) 各自要多次网络往返,
+        # 放到线程池里并行执行, 不阻塞 UI 线程
+        self._log("[*] 正在检测 系统代理 / DNS / Clash API ...")
+        self._executor.submit(self._worker_detect_proxy)
+
+    def _worker_detect_proxy(self):
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="probe") as pool:
+            f_proxy = pool.submit(detect_system_proxy)
+            f_dns = pool.submit(is_dns_poisoned, "www.ting13.cc")
+            f_clash = pool.submit(self._probe_clash)
+
+            detected = f_proxy.result()
+            if detected:
+                self._msg_queue.put(("proxy_detected", detected))
+                self._log(f"[OK] 检测到代理: {detected}")
+            else:
+                self._log("[!] 未检测到系统代理")
+                self._msg_queue.put((
+                    "msgbox_info", "提示",
+                    "未检测到系统代理。\n请确认 Clash Verge 已开启「系统代理」。"))
+
+            if f_dns.result():
+                # 此时 DoH 结果已在缓存中, 不会再发请求
+                real_ip = resolve_via_doh("www.ting13.cc")
+                self._log(f"[!] DNS 被污染! 真实 IP: {real_ip}")
+                self._log("[!] 请在 Clash Verge 中切换到「全局模式」")
+            else:
+                self._log("[OK] DNS 正常")
 
-        self._log("[*] 正在检测 DNS 状态...")
-        if is_dns_poisoned("www.ting13.cc"):
-            real_ip = resolve_via_doh("www.ting13.cc")
-            self._log(f"[!] DNS 被污染! 真实 IP: {real_ip}")
-            self._log("[!] 请在 Clash Verge 中切换到「全局模式」")
-        else:
-            self._log("[OK] DNS 正常")
+            f_clash.result()
 
-        self._log("[*] 正在检测 Clash API...")
+    def _probe_clash(self):
         rotator = ClashRotator()
         if rotator.auto_detect():
-            nodes = rotator.load_nodes()
+            nodes = rotator.load_nodes_cached()
             if nodes:
                 self._clash_rotator = rotator
-                self._rotate_var.set(True)
-                self.clash_status_label.configure(
-                    text=f"已连接  {rotator.group_name}  {len(nodes)}个节点",
-                    text_color="#2B7A0B")
+                self._msg_queue.put((
+                    "clash_status",
+                    f"已连接  {rotator.group_name}  {len(nodes)}个节点",
+                    "#2B7A0B", True))
                 self._log(f"[OK] Clash API: {rotator.api_url}")
             else:
-                self.clash_status_label.configure(
-                    text="已连接但无节点", text_color="orange")
+                self._msg_queue.put(("clash_status", "已连接但无节点", "orange", False))
         else:
-            self.clash_status_label.configure(
-                text="未检测到 Clash API", text_color="gray")
+            self._msg_queue.put(("clash_status", "未检测到 Clash API", "gray", False))
             self._log("[*] 未检测到 Clash API (自动换IP不可用)")
 
     # ══════════════════════════════════════════════════════════
@@ -471,63 +590,66 @@ class App(ctk.CTk):
         self._set_buttons(True)
         self._log("[*] 正在打开浏览器, 请在浏览器中登录 ting13.cc ...")
         self._set_status("等待登录...")
+        self._future = self._executor.submit(self._worker_login)
 
-        def worker():
-            try:
-                with sync_playwright() as pw:
-                    launch_kwargs: Dict = {"headless": False}
-                    from ting13.core.utils import get_chrome_exe_path
-                    chrome = get_chrome_exe_path()
-                    if chrome:
-                        launch_kwargs["executable_path"] = chrome
-                    if get_proxy():
-                        launch_kwargs["proxy"] = {"server": get_proxy()}
-
-                    browser = pw.chromium.launch(**launch_kwargs)
-                    context = browser.new_context()
-                    page = context.new_page()
-                    page.goto("https://m.ting13.cc/user/public/login.html",
-                              wait_until="domcontentloaded", timeout=30000)
-                    self._log("[*] 浏览器已打开, 请登录后关闭浏览器窗口")
-
-                    logged_in = False
-                    for _ in range(600):
-                        try:
-                            _ = page.url
-                        except Exception:
-                            break
-                        cookies = context.cookies()
-                        has_session = any(
-                            c.get("name") in ("PHPSESSID", "user_token", "token", "uid")
-                            or "user" in c.get("name", "").lower()
-                            for c in cookies)
-                        if has_session and "login" not in page.url:
-                            logged_in = True
-                            break
-                        page.wait_for_timeout(1000)
-
-                    try:
-                        cookies = context.cookies()
-                    except Exception:
-                        cookies = []
-
-                    if cookies:
-                        save_cookies(cookies)
-                        self._log(f"[OK] 已保存 {len(cookies)} 个 cookies")
-                        if logged_in:
-                            self._log("[OK] 登录成功!")
-                    try:
-                        browser.close()
-                    except Exception:
-                        pass
-            except Exception as e:
-                self._log(f"[FAIL] 登录流程出错: {e}")
-            finally:
-                self._msg_queue.put(("update_login",))
-                self._set_buttons(False)
-                self._set_status("就绪")
-
-        threading.Thread(target=worker, daemon=True).start()
+    def _worker_login(self):
+        try:
+            # 延迟导入: playwright 包体积大, 只在真正登录时加载
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as pw:
+                launch_kwargs: Dict = {"headless": False}
+                from ting13.core.utils import get_chrome_exe_path
+                chrome = get_chrome_exe_path()
+                if chrome:
+                    launch_kwargs["executable_path"] = chrome
+                if get_proxy():
+                    launch_kwargs["proxy"] = {"server": get_proxy()}
+
+                # 持久化 context: 浏览器 profile 落盘,
+                # 重复登录时通常已带着会话, 打开即是已登录状态
+                user_dir = os.path.join(
+                    os.path.expanduser("~"), ".ting13_pw_profile")
+                context = pw.chromium.launch_persistent_context(
+                    user_dir, **launch_kwargs)
+                page = context.pages[0] if context.pages else context.new_page()
+                page.goto("https://m.ting13.cc/user/public/login.html",
+                          wait_until="domcontentloaded", timeout=30000)
+                self._log("[*] 浏览器已打开, 请登录后关闭浏览器窗口")
+
+                # 事件驱动等待: 登录成功后页面会跳离登录页,
+                # 由导航事件唤醒, 不再每秒轮询 context.cookies()
+                logged_in = False
+                try:
+                    page.wait_for_url(
+                        lambda u: "login" not in u, timeout=600_000)
+                    cookies = context.cookies()
+                    names = {c.get("name", "") for c in cookies}
+                    logged_in = bool(
+                        Ting13Source.SESSION_COOKIE_NAMES & names)
+                except Exception:
+                    # 超时或用户直接关闭了浏览器窗口
+                    pass
+
+                try:
+                    cookies = context.cookies()
+                except Exception:
+                    cookies = []
+
+                if cookies:
+                    save_cookies(cookies)
+                    self._log(f"[OK] 已保存 {len(cookies)} 个 cookies")
+                    if logged_in:
+                        self._log("[OK] 登录成功!")
+                try:
+                    context.close()
+                except Exception:
+                    pass
+        except Exception as e:
+            self._log(f"[FAIL] 登录流程出错: {e}")
+        finally:
+            self._msg_queue.put(("update_login",))
+            self._set_buttons(False)
+            self._set_status("就绪")
 
     # ══════════════════════════════════════════════════════════
     # 解析书籍 (通用 — 使用 Source 插件)
@@ -543,7 +665,7 @@ class App(ctk.CTk):
         source = find_source(url)
         if not source:
             messagebox.showerror("错误",
-                f"无法识别的 URL\n\n支持: {', '.join(get_source_names())}")
+                f"无法识别的 URL\n\n支持: {_SITES}")
             return
 
         url_type = source.detect_url_type(url)
@@ -565,28 +687,25 @@ class App(ctk.CTk):
         self._source = source
         self._book_info = None
 
-        def worker():
-            old_stdout = sys.stdout
-            sys.stdout = QueueWriter(self._msg_queue)
-            try:
-                info = source.parse_book(url)
-                self._book_info = info
-                total = len(info.chapters)
-                self._set_info(
-                    f"[{source.name}] {info.title}   "
-                    f"作者: {info.author}   章节: {total}")
-                self._set_status(f"解析完成 - {total} 个章节")
-                self._set_progress(1, "完成")
-                self._log(f"[OK] {info.title} ({total} 章) [{source.name}]")
-            except Exception as e:
-                self._set_info(f"解析失败: {e}")
-                self._set_status("解析失败")
-                self._log(f"[FAIL] 解析失败: {e}")
-            finally:
-                sys.stdout = old_stdout
-                self._set_buttons(False)
-
-        threading.Thread(target=worker, daemon=True).start()
+        self._future = self._executor.submit(self._worker_parse, url, source)
+
+    def _worker_parse(self, url: str, source: Source):
+        try:
+            info = source.parse_book(url)
+            self._book_info = info
+            total = len(info.chapters)
+            self._set_info(
+                f"[{source.name}] {info.title}   "
+                f"作者: {info.author}   章节: {total}")
+            self._set_status(f"解析完成 - {total} 个章节")
+            self._set_progress(1, "完成")
+            self._log(f"[OK] {info.title} ({total} 章) [{source.name}]")
+        except Exception as e:
+            self._set_info(f"解析失败: {e}")
+            self._set_status("解析失败")
+            self._log(f"[FAIL] 解析失败: {e}")
+        finally:
+            self._set_buttons(False)
 
     # ══════════════════════════════════════════════════════════
     # 开始下载 (通用 — 使用 DownloadEngine)
@@ -610,11 +729,14 @@ class App(ctk.CTk):
         if hasattr(source, 'set_headless'):
             source.set_headless(self.headless_var.get())
 
+        # Tk 控件值只在主线程读取, 打包成参数传给 worker —
+        # worker 线程内禁止任何跨线程的 Tcl 调用
         output_dir = self._get_output_dir()
         start, end = self._get_range()
 
         self._is_downloading = True
         self._stop_requested = False
+        self._stop_event.clear()
         self._set_buttons(True)
         self._set_status("准备下载...")
         self._set_progress(0, "0%")
@@ -627,60 +749,74 @@ class App(ctk.CTk):
             except ValueError:
                 rotate_interval = 30
 
-        def worker():
-            old_stdout = sys.stdout
-            sys.stdout = QueueWriter(self._msg_queue)
-            try:
-                # 如果未解析, 先解析
-                if self._book_info is None:
-                    url_type = source.detect_url_type(url)
-                    if url_type == "play":
-                        from ting13.core.models import Chapter
-                        self._book_info = BookInfo(
-                            title="single_audio",
-                            chapters=[Chapter(index=1, title="单集", play_url=url)],
-                            source_name=source.name,
-                        )
-                    else:
-                        self._log("[*] 尚未解析, 先解析书籍...")
-                        self._book_info = source.parse_book(url)
-
-                # 创建回调
-                callbacks = DownloadCallbacks(
-                    on_log=self._log,
-                    on_status=self._set_status,
-                    on_info=self._set_info,
-                    on_progress=self._set_progress,
-                    is_stopped=lambda: self._stop_requested,
-                )
-
-                # 创建并运行下载引擎
-                engine = DownloadEngine(
-                    source=source,
-                    callbacks=callbacks,
-                    clash_rotator=self._clash_rotator,
-                    rotate_interval=rotate_interval,
-                )
-                engine.run(self._book_info, output_dir, start, end)
-
-            except Exception as e:
-                self._log(f"[FAIL] 下载出错: {e}")
-                self._set_status(f"出错: {e}")
-            finally:
-                sys.stdout = old_stdout
-                self._is_downloading = False
-                self._stop_requested = False
-                self._set_buttons(False)
-
-        self._worker_thread = threading.Thread(target=worker, daemon=True)
-        self._worker_thread.start()
+        self._future = self._executor.submit(
+            self._worker_download, url, source, output_dir,
+            start, end, rotate_interval,
+        )
+
+    def _worker_download(self, url: str, source: Source, output_dir: str,
+                         start: int, end: Optional[int], rotate_interval: int):
+        try:
+            # 延迟导入: 下载引擎只在真正下载时才需要
+            from ting13.core.download import DownloadEngine, DownloadCallbacks
+
+            # 如果未解析, 先解析
+            if self._book_info is None:
+                url_type = source.detect_url_type(url)
+                if url_type == "play":
+                    from ting13.core.models import Chapter
+                    self._book_info = BookInfo(
+                        title="single_audio",
+                        chapters=[Chapter(index=1, title="单集", play_url=url)],
+                        source_name=source.name,
+                    )
+                else:
+                    self._log("[*] 尚未解析, 先解析书籍...")
+                    self._book_info = source.parse_book(url)
+
+            # 创建回调
+            callbacks = DownloadCallbacks(
+                on_log=self._log,
+                on_status=self._set_status,
+                on_info=self._set_info,
+                on_progress=self._set_progress,
+                is_stopped=lambda: self._stop_requested,
+                stop_event=self._stop_event,
+            )
+
+            # 创建并运行下载引擎
+            engine = DownloadEngine(
+                source=source,
+                callbacks=callbacks,
+                clash_rotator=self._clash_rotator,
+                rotate_interval=rotate_interval,
+            )
+            engine.run(self._book_info, output_dir, start, end)
+
+        except Exception as e:
+            self._log(f"[FAIL] 下载出错: {e}")
+            self._set_status(f"出错: {e}")
+        finally:
+            self._is_downloading = False
+            self._stop_requested = False
+            self._set_buttons(False)
 
     def _on_stop(self):
         if self._is_downloading:
             self._stop_requested = True
+            self._stop_event.set()
+            # 若任务还在排队未开始执行, 直接取消
+            if self._future is not None:
+                self._future.cancel()
             self._set_status("正在停止...")
             self._log("[!] 正在停止下载...")
 
+    def _on_close(self):
+        self._stop_requested = True
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
 
 # ══════════════════════════════════════════════════════════════
 # 入口
@@ -13,16 +13,20 @@
 """
 
 import multiprocessing
+from multiprocessing import shared_memory
 multiprocessing.freeze_support()
 
 import os
 import re
 import sys
 import json
+import pickle
 import queue
 import time
 import threading
 import webbrowser
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
 
 if __package__ in (None, ""):
@@ -34,22 +38,12 @@ if __package__ in (None, ""):
 import customtkinter as ctk
 from tkinter import filedialog, messagebox
 
-# ── ting13.cc 旧架构 (Playwright) ────────────────────────────
+# ── ting13.cc 旧架构 ─────────────────────────────────────────
+# GUI 进程只 import 自己用得到的名字; playwright / 下载引擎等
+# 重型依赖延迟到实际用到的回调里加载, 缩短冷启动到首帧的时间
 from ting13.legacy.ting13_downloader import (
-    _is_frozen,
-    _get_bundled_base,
-    Chapter,
-    BookInfo,
-    fetch_page,
-    parse_book_page,
-    extract_audio_url,
-    extract_audio_url_fast,
-    sanitize_filename,
-    download_cover,
     detect_url_type,
-    _build_session,
     save_cookies,
-    load_cookies,
     clear_cookies,
     has_cookies,
     set_proxy,
@@ -59,12 +53,6 @@ from ting13.legacy.ting13_downloader import (
     resolve_via_doh,
     _is_dns_poisoned,
 )
-from playwright.sync_api import sync_playwright
-
-# ── huanting.cc 新架构 (DownloadEngine) ──────────────────────
-from ting13.core.download import DownloadEngine, DownloadCallbacks
-from ting13.core.network import set_proxy as core_set_proxy
-from ting13.sources.huanting import HuantingSource
 
 
 # ══════════════════════════════════════════════════════════════
@@ -72,12 +60,17 @@ from ting13.sources.huanting import HuantingSource
 # ══════════════════════════════════════════════════════════════
 
 class UrlHistory:
+    """URL 历史: 截断显示名只算一次并缓存, 显示名->URL 走反查字典"""
+
     MAX_ITEMS = 10
     FILENAME = "url_history.json"
 
     def __init__(self):
         self._path = self._resolve_path()
-        self._urls: List[str] = []
+        # url -> 截断后的显示名 (O(1) 去重 + 显示名只算一次)
+        self._urls: "OrderedDict[str, str]" = OrderedDict()
+        self._rev: Dict[str, str] = {}  # 显示名 -> url 反查
+        self._last_saved: Optional[str] = None  # 上次落盘的序列化内容
         self._load()
 
     def _resolve_path(self) -> str:
@@ -87,19 +80,37 @@ class UrlHistory:
             base = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(base, self.FILENAME)
 
+    @staticmethod
+    def _truncate(url: str) -> str:
+        return url if len(url) <= 60 else url[:57] + "..."
+
     def _load(self):
         try:
             with open(self._path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             if isinstance(data, list):
-                self._urls = [u for u in data if isinstance(u, str)][:self.MAX_ITEMS]
+                for u in data[:self.MAX_ITEMS]:
+                    if isinstance(u, str):
+                        label = self._truncate(u)
+                        self._urls[u] = label
+                        self._rev[label] = u
+                self._last_saved = json.dumps(
+                    list(self._urls), ensure_ascii=False, indent=2)
         except (FileNotFoundError, json.JSONDecodeError, OSError):
-            self._urls = []
+            pass
 
     def _save(self):
+        # 内容没变就不写盘 (重复解析同一本书时 add 是 no-op);
+        # 写盘走临时文件 + os.replace, 避免崩溃留下半个文件
+        data = json.dumps(list(self._urls), ensure_ascii=False, indent=2)
+        if data == self._last_saved:
+            return
+        tmp = self._path + ".tmp"
         try:
-            with open(self._path, "w", encoding="utf-8") as f:
-                json.dump(self._urls, f, ensure_ascii=False, indent=2)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp, self._path)
+            self._last_saved = data
         except OSError:
             pass
 
@@ -111,52 +122,93 @@ class UrlHistory:
         url = url.strip()
         if not url:
             return
-        if url in self._urls:
-            self._urls.remove(url)
-        self._urls.insert(0, url)
-        self._urls = self._urls[:self.MAX_ITEMS]
+        self._urls.pop(url, None)
+        label = self._truncate(url)
+        self._urls[url] = label
+        self._urls.move_to_end(url, last=False)
+        self._rev[label] = url
+        while len(self._urls) > self.MAX_ITEMS:
+            _, old_label = self._urls.popitem(last=True)
+            self._rev.pop(old_label, None)
         self._save()
 
     def clear(self):
         self._urls.clear()
+        self._rev.clear()
         self._save()
 
     def display_items(self) -> List[str]:
         if not self._urls:
             return ["(无历史记录)"]
-        items = []
-        for u in self._urls:
-            label = u if len(u) <= 60 else u[:57] + "..."
-            items.append(label)
-        return items
+        return list(self._urls.values())
 
     def url_for_display(self, display: str) -> Optional[str]:
         if display == "(无历史记录)":
             return None
-        for u in self._urls:
-            short = u if len(u) <= 60 else u[:57] + "..."
-            if short == display:
-                return u
-        return display
+        return self._rev.get(display, display)
+
+
+# 从粘贴内容中提取第一个 URL (模块级预编译)
+_URL_RE = re.compile(r'(https?://[^\s]+)')
+
+# 系统代理检测结果短 TTL 缓存: 连续点击解析/下载不必反复读注册表
+_PROXY_CACHE_TTL = 5.0
+_proxy_cache = (0.0, None)
+
+
+def _detect_system_proxy_cached() -> Optional[str]:
+    global _proxy_cache
+    now = time.monotonic()
+    if now - _proxy_cache[0] < _PROXY_CACHE_TTL:
+        return _proxy_cache[1]
+    detected = detect_system_proxy()
+    _proxy_cache = (now, detected)
+    return detected
+
+
+# URL 类型识别共用一个 HuantingSource 实例 (懒初始化, 懒 import),
+# 不必每次点击都新建对象; 实例内部还会缓存最近一次的识别结果
+_HUANTING = None
+
+
+def _huanting():
+    global _HUANTING
+    if _HUANTING is None:
+        from ting13.sources.huanting import HuantingSource
+        _HUANTING = HuantingSource()
+    return _HUANTING
 
 
 # ══════════════════════════════════════════════════════════════
 # 站点识别
 # ══════════════════════════════════════════════════════════════
 
+# 已知站点域名的单一交替正则: 一次扫描代替 4 次子串查找
+_SITE_RE = re.compile(r'(ting13\.(?:cc|com)|ting22\.com|huanting\.cc)', re.I)
+
+
 def detect_site(url: str) -> str:
-    url_lower = url.lower()
-    if any(d in url_lower for d in ["ting13.cc", "ting13.com"]):
-        return "ting13"
-    if any(d in url_lower for d in ["ting22.com", "huanting.cc"]):
-        return "huanting"
-    return "unknown"
+    m = _SITE_RE.search(url)
+    if not m:
+        return "unknown"
+    return "ting13" if m.group(1).lower().startswith("ting13") else "huanting"
 
 
 # ══════════════════════════════════════════════════════════════
 # 子进程工作函数 — 从独立模块导入 (解决 PyInstaller frozen spawn 问题)
 # ══════════════════════════════════════════════════════════════
-from ting13.workers.ting13_worker import worker_parse, worker_download
+from ting13.workers.ting13_worker import (
+    worker_parse, worker_download, TaggedQueue,
+)
+
+
+def _pool_worker_init():
+    """进程池子进程预热：spawn/frozen 下把重型依赖一次性 import 好
+
+    没有预热时每次点击"解析/下载"都要新起进程并重新 import
+    Playwright / requests 全家桶 (打包后要几秒)；常驻池子只付一次。
+    """
+    import ting13.workers.ting13_worker  # noqa: F401
 
 
 # ══════════════════════════════════════════════════════════════
@@ -164,17 +216,21 @@ from ting13.workers.ting13_worker import worker_parse, worker_download
 # ══════════════════════════════════════════════════════════════
 
 class TaskTab:
-    def __init__(self, app: "App", parent_frame: ctk.CTkFrame, tab_name: str):
+    LOG_MAX_LINES = 2000  # 日志控件保留的最大行数 (环形截断)
+
+    def __init__(self, app: "App", parent_frame: ctk.CTkFrame,
+                 tab_name: str, tab_id: str):
         self._app = app
         self._parent = parent_frame
         self._tab_name = tab_name
+        self._tab_id = tab_id  # 稳定标识 (改名不变), 共享队列按它分发
 
         self._book_data: Optional[dict] = None
         self._current_site: str = "ting13"
         self._is_downloading = False
-        self._worker_proc: Optional[multiprocessing.Process] = None
-        self._stop_evt: Optional[multiprocessing.Event] = None
-        self._mp_queue: Optional[multiprocessing.Queue] = None
+        self._async_result = None  # 进程池任务句柄 (AsyncResult)
+        self._stop_evt = None
+        self._mp_queue = None
 
         self._build_ui()
 
@@ -346,8 +402,12 @@ class TaskTab:
 
     def _get_url(self) -> str:
         raw = self.url_entry.get().strip()
-        if raw.count("http") > 1:
-            m = re.search(r'(https?://[^\s]+)', raw)
+        first = raw.find("http")
+        if first == -1:
+            return raw
+        # 只关心是否出现第二个 "http", 不用 count 扫完整串
+        if raw.find("http", first + 4) != -1:
+            m = _URL_RE.search(raw)
             if m:
                 raw = m.group(1)
                 self.url_entry.delete(0, "end")
@@ -387,66 +447,92 @@ class TaskTab:
         self.browse_btn.configure(state=st_main)
         self.paste_btn.configure(state=st_main)
 
-    def poll_queue(self):
-        """主线程轮询：从 multiprocessing Queue 读消息更新 UI"""
-        if self._mp_queue is None:
-            return
-        try:
-            for _ in range(15):
-                msg = self._mp_queue.get_nowait()
-                kind = msg[0]
-
-                if kind == "log":
-                    self.log_text.configure(state="normal")
-                    self.log_text.insert("end", msg[1] + "\n")
-                    self.log_text.see("end")
-                    self.log_text.configure(state="disabled")
-                elif kind == "status":
-                    self.status_label.configure(text=msg[1])
-                elif kind == "info":
-                    self.info_label.configure(text=msg[1])
-                elif kind == "progress":
-                    val = msg[1]
-                    label = msg[2] if len(msg) > 2 else ""
-                    self.progress_bar.set(val)
-                    self.progress_label.configure(
-                        text=label if label else f"{val * 100:.0f}%"
-                    )
-                elif kind == "buttons":
-                    working = msg[1]
-                    self._ui_set_buttons(working)
-                    if not working:
-                        self._is_downloading = False
-                elif kind == "rename_tab":
-                    new_name = msg[1]
-                    old_name = self._tab_name
-                    try:
-                        tv = self._app.tabview
-                        tv.rename(old_name, new_name)
-                        if tv._current_name == old_name:
-                            tv._current_name = new_name
-                        self._tab_name = new_name
-                        tabs = self._app._tabs
-                        if old_name in tabs:
-                            tabs[new_name] = tabs.pop(old_name)
-                    except Exception:
-                        pass
-                elif kind == "result":
-                    key = msg[1]
-                    value = msg[2]
-                    self._book_data = value
-                    if key == "huanting_book":
-                        self._current_site = "huanting"
-                    else:
-                        self._current_site = "ting13"
-                elif kind == "rotate_request":
-                    reason = msg[1] if len(msg) > 1 else ""
-                    self._app.handle_rotate_request(self._tab_name, reason)
-        except (queue.Empty, EOFError, OSError):
-            pass
+    def _trim_log(self):
+        """超过上限时丢弃最旧的行, 防止长任务日志拖慢 Text 控件"""
+        idx = int(self.log_text.index("end-1c").split(".")[0])
+        if idx > self.LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{idx - self.LOG_MAX_LINES}.0")
+
+    def apply_message(self, msg):
+        """应用一条 (去掉 tab_id 前缀的) worker 消息 (主线程调用)"""
+        kind = msg[0]
 
-        if self._worker_proc is not None and not self._worker_proc.is_alive():
-            self._worker_proc = None
+        if kind == "log":
+            self.log_text.configure(state="normal")
+            self.log_text.insert("end", msg[1] + "\n")
+            self._trim_log()
+            self.log_text.see("end")
+            self.log_text.configure(state="disabled")
+        elif kind == "log_batch":
+            # 子进程攒批后的日志: N 条只做一次插入/重绘
+            self.log_text.configure(state="normal")
+            self.log_text.insert("end", "\n".join(msg[1]) + "\n")
+            self._trim_log()
+            self.log_text.see("end")
+            self.log_text.configure(state="disabled")
+        elif kind == "status":
+            self.status_label.configure(text=msg[1])
+        elif kind == "info":
+            self.info_label.configure(text=msg[1])
+        elif kind == "progress":
+            val = msg[1]
+            label = msg[2] if len(msg) > 2 else ""
+            self.progress_bar.set(val)
+            self.progress_label.configure(
+                text=label if label else f"{val * 100:.0f}%"
+            )
+        elif kind == "buttons":
+            working = msg[1]
+            self._ui_set_buttons(working)
+            if not working:
+                self._is_downloading = False
+        elif kind == "rename_tab":
+            new_name = msg[1]
+            old_name = self._tab_name
+            try:
+                tv = self._app.tabview
+                tv.rename(old_name, new_name)
+                if tv._current_name == old_name:
+                    tv._current_name = new_name
+                self._tab_name = new_name
+                tabs = self._app._tabs
+                if old_name in tabs:
+                    tabs[new_name] = tabs.pop(old_name)
+            except Exception:
+                pass
+        elif kind == "result":
+            key = msg[1]
+            value = msg[2]
+            self._book_data = value
+            if key == "huanting_book":
+                self._current_site = "huanting"
+            else:
+                self._current_site = "ting13"
+        elif kind == "result_shm":
+            # 大结果走共享内存: 队列消息只带 (名字, 长度)
+            key, shm_name, size = msg[1], msg[2], msg[3]
+            try:
+                shm = shared_memory.SharedMemory(name=shm_name)
+                try:
+                    value = pickle.loads(bytes(shm.buf[:size]))
+                finally:
+                    shm.close()
+                    shm.unlink()
+            except Exception:
+                return
+            self._book_data = value
+            if key == "huanting_book":
+                self._current_site = "huanting"
+            else:
+                self._current_site = "ting13"
+        elif kind == "rotate_request":
+            reason = msg[1] if len(msg) > 1 else ""
+            self._app.handle_rotate_request(self._tab_name, reason)
+
+    def check_finished(self):
+        """检查池子任务是否已结束, 收尾按钮状态 (主线程调用)"""
+        if self._async_result is not None and self._async_result.ready():
+            self._async_result = None
             if self._is_downloading:
                 self._is_downloading = False
                 self._ui_set_buttons(False)
@@ -454,44 +540,52 @@ class TaskTab:
     # ── 启动子进程 ──
 
     def _launch_process(self, target, args):
-        self._mp_queue = multiprocessing.Queue()
-        self._stop_evt = multiprocessing.Event()
+        # 任务派发到常驻进程池; 所有页签共用一条 Manager 队列,
+        # 消息带 tab_id 前缀, 由 App 的事件桥统一 drain 后分发
+        self._mp_queue = TaggedQueue(self._app.shared_queue, self._tab_id)
+        self._stop_evt = self._app.mp_manager.Event()
         full_args = (self._mp_queue, self._stop_evt) + args
-        self._worker_proc = multiprocessing.Process(
-            target=target, args=full_args, daemon=True
-        )
-        self._worker_proc.start()
+        self._async_result = self._app.worker_pool.apply_async(
+            target, full_args)
+        self._app._active_tasks.add(self)
 
     # ── 解析 ──
 
-    def _on_parse(self):
-        self._app.apply_proxy()
-        url = self._get_url()
+    @staticmethod
+    def _validate_url(url: str):
+        """纯校验, 不碰任何控件: 返回 (site, url_type, 错误文案)"""
         if not url:
-            messagebox.showwarning("提示", "请先输入书籍 URL")
-            return
-
+            return None, None, "请先输入书籍 URL"
         site = detect_site(url)
         if site == "huanting":
-            _ht = HuantingSource()
-            url_type = _ht.detect_url_type(url)
-            if url_type == "unknown":
-                messagebox.showerror("错误", "无法识别的 URL 格式")
-                return
-            self._current_site = "huanting"
+            url_type = _huanting().detect_url_type(url)
         elif site == "ting13":
             url_type = detect_url_type(url)
-            if url_type == "unknown":
-                messagebox.showerror("错误", "无法识别的 URL 格式")
-                return
-            if url_type == "play":
-                self._book_data = None
-                self._current_site = "ting13"
-                self.info_label.configure(text="单集播放链接，可直接点击「开始下载」")
-                return
-            self._current_site = "ting13"
         else:
-            messagebox.showerror("错误", "无法识别的 URL，支持 ting13.cc / ting22.com")
+            return None, None, "无法识别的 URL，支持 ting13.cc / ting22.com"
+        if url_type == "unknown":
+            return site, None, "无法识别的 URL 格式"
+        return site, url_type, None
+
+    def _defer_dialog(self, text: str, warn: bool = False):
+        # 弹窗是模态的, 会把事件循环卡在本次回调里;
+        # 推迟到 idle 再弹, 先让回调返回, 其他页签的消息照常处理
+        show = messagebox.showwarning if warn else messagebox.showerror
+        title = "提示" if warn else "错误"
+        self._app.after_idle(lambda: show(title, text))
+
+    def _on_parse(self):
+        self._app.apply_proxy()
+        url = self._get_url()
+        site, url_type, err = self._validate_url(url)
+        if err:
+            self._defer_dialog(err, warn=not url)
+            return
+
+        self._current_site = site
+        if site == "ting13" and url_type == "play":
+            self._book_data = None
+            self.info_label.configure(text="单集播放链接，可直接点击「开始下载」")
             return
 
         self._app.save_url_to_history(url)
@@ -510,26 +604,12 @@ class TaskTab:
     def _on_download(self):
         self._app.apply_proxy()
         url = self._get_url()
-        if not url:
-            messagebox.showwarning("提示", "请先输入书籍 URL")
-            return
-
-        site = detect_site(url)
-        if site == "huanting":
-            self._current_site = "huanting"
-            _ht = HuantingSource()
-            url_type = _ht.detect_url_type(url)
-        elif site == "ting13":
-            self._current_site = "ting13"
-            url_type = detect_url_type(url)
-        else:
-            messagebox.showerror("错误", "无法识别的 URL")
-            return
-
-        if url_type == "unknown":
-            messagebox.showerror("错误", "无法识别的 URL 格式")
+        site, url_type, err = self._validate_url(url)
+        if err:
+            self._defer_dialog(err, warn=not url)
             return
 
+        self._current_site = site
         self._app.save_url_to_history(url)
 
         output_dir = self._get_output_dir()
@@ -550,6 +630,7 @@ class TaskTab:
             self._app.rotate_enabled,
             self._app.get_rotate_interval(),
             self._book_data,
+            self._app.get_concurrency(),
         ))
 
     # ── 停止 ──
@@ -564,11 +645,9 @@ class TaskTab:
             self.log_text.configure(state="disabled")
 
     def kill_process(self):
+        # 池子进程是共享的, 不能单独 terminate; 置停止事件协作退出
         if self._stop_evt is not None:
             self._stop_evt.set()
-        if self._worker_proc is not None and self._worker_proc.is_alive():
-            self._worker_proc.terminate()
-            self._worker_proc.join(timeout=2)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -593,14 +672,38 @@ class App(ctk.CTk):
         ctk.set_default_color_theme("blue")
 
         self.clash_rotator: Optional[ClashRotator] = None
+        self._logged_in: Optional[bool] = None  # has_cookies() 的内存缓存
         self._tab_counter = 0
         self._tabs: Dict[str, TaskTab] = {}
         self._last_rotate_time: float = 0.0
         self.url_history = UrlHistory()
 
+        # 常驻进程池: 解析/下载任务复用已预热的子进程,
+        # 省掉每次点击 spawn + 重新 import 的秒级开销
+        self.mp_manager = multiprocessing.Manager()
+        self.worker_pool = multiprocessing.Pool(
+            processes=max(4, os.cpu_count() or 4),
+            initializer=_pool_worker_init,
+        )
+        # 所有页签共用的消息队列 (消息首元素是 tab_id)
+        self.shared_queue = self.mp_manager.Queue()
+        self._tabs_by_id: Dict[str, TaskTab] = {}
+        # 当前选中的页签对象, 切换/增删时更新,
+        # 免得每条日志都走一次 tabview.get() 字符串查找
+        self._current_task: Optional[TaskTab] = None
+        # 有任务在跑的页签集合 — 完成轮询只扫这些, 不扫全部页签
+        self._active_tasks: set = set()
+
         self._build_ui()
         self._add_task_tab()
-        self._poll_all()
+
+        # 事件驱动的消息桥: 后台线程阻塞在队列上, 有消息才唤醒 Tk,
+        # 空闲时不再每 80ms 空转一次
+        self._pending_msgs: deque = deque()
+        self.bind("<<WorkerMsg>>", self._on_worker_msg)
+        threading.Thread(
+            target=self._pump_queue, name="msg-pump", daemon=True).start()
+        self._poll_finished()
 
     def _build_ui(self):
         self.grid_columnconfigure(0, weight=1)
@@ -691,6 +794,11 @@ class App(ctk.CTk):
         self.cooldown_entry.pack(side="left", padx=2)
         ctk.CTkLabel(bottom_row, text="秒").pack(side="left")
 
+        ctk.CTkLabel(bottom_row, text="  并发").pack(side="left")
+        self.concurrency_entry = ctk.CTkEntry(bottom_row, width=35)
+        self.concurrency_entry.insert(0, "4")
+        self.concurrency_entry.pack(side="left", padx=2)
+
         self.clash_status_label = ctk.CTkLabel(
             bottom_row, text="", text_color="gray", font=ctk.CTkFont(size=10)
         )
@@ -711,20 +819,32 @@ class App(ctk.CTk):
         self._update_login_status()
 
         # ── Row 3: 标签页容器 ──
-        self.tabview = ctk.CTkTabview(self, height=500)
+        self.tabview = ctk.CTkTabview(
+            self, height=500, command=self._on_tab_changed)
         self.tabview.grid(row=3, column=0, sticky="nsew", padx=12, pady=(6, 12))
 
     # ── 标签页管理 ──
 
+    def _on_tab_changed(self):
+        self._current_task = self._tabs.get(self.tabview.get())
+
     def _add_task_tab(self):
         self._tab_counter += 1
         tab_name = f"任务 {self._tab_counter}"
+        tab_id = f"task-{self._tab_counter}"
         frame = self.tabview.add(tab_name)
-        task = TaskTab(self, frame, tab_name)
+        task = TaskTab(self, frame, tab_name, tab_id)
         self._tabs[tab_name] = task
+        self._tabs_by_id[tab_id] = task
         self.tabview.set(tab_name)
+        self._current_task = task
 
     def remove_task_tab(self, tab_name: str):
+        # 关闭可能要弹模态确认框; 推迟到 idle 再处理,
+        # 让触发它的回调先返回, 事件循环不被卡在回调里
+        self.after_idle(lambda: self._remove_task_tab_now(tab_name))
+
+    def _remove_task_tab_now(self, tab_name: str):
         task = self._tabs.get(tab_name)
         if not task:
             return
@@ -743,10 +863,13 @@ class App(ctk.CTk):
             return
 
         del self._tabs[tab_name]
+        self._tabs_by_id.pop(task._tab_id, None)
+        self._active_tasks.discard(task)
         try:
             self.tabview.delete(tab_name)
         except Exception:
             pass
+        self._on_tab_changed()  # 删除后 tabview 自动选中别的页签
 
     # ── 导航栏 ──
 
@@ -757,8 +880,7 @@ class App(ctk.CTk):
         url = self.url_history.url_for_display(display)
         if not url:
             return
-        current = self.tabview.get()
-        task = self._tabs.get(current)
+        task = self._current_task
         if task:
             task.url_entry.delete(0, "end")
             task.url_entry.insert(0, url)
@@ -791,6 +913,12 @@ class App(ctk.CTk):
         except ValueError:
             return 3
 
+    def get_concurrency(self) -> int:
+        try:
+            return min(max(int(self.concurrency_entry.get()), 1), 16)
+        except ValueError:
+            return 4
+
     def _get_cooldown(self) -> float:
         try:
             return max(float(self.cooldown_entry.get()), 5.0)
@@ -817,22 +945,30 @@ class App(ctk.CTk):
         new_node = self.clash_rotator.rotate()
         if new_node:
             self._last_rotate_time = time.time()
-            msg = f"[*] 已切换代理节点: {new_node} (来自 {tab_name}: {reason})"
-            for name, task in self._tabs.items():
-                if task._mp_queue is not None:
-                    task.log_text.configure(state="normal")
-                    task.log_text.insert("end", msg + "\n")
-                    task.log_text.see("end")
-                    task.log_text.configure(state="disabled")
+            self._broadcast_log(
+                f"[*] 已切换代理节点: {new_node} (来自 {tab_name}: {reason})")
         else:
             self._log_to_current(f"[!] [{tab_name}] 换IP失败: {reason}")
 
+    def _broadcast_log(self, msg: str):
+        """把一条日志发给所有有活动任务的页签 (走统一的消息应用路径)
+
+        换IP请求本来就在主线程处理, 不必再绕一圈共享队列;
+        复用 apply_message 的 log 分支, 不直接戳各页签的控件。
+        """
+        for task in self._tabs_by_id.values():
+            if task._mp_queue is not None:
+                try:
+                    task.apply_message(("log", msg))
+                except Exception:
+                    pass
+
     # ── 代理设置 ──
 
     def apply_proxy(self):
         proxy = self.proxy_entry.get().strip()
         if not proxy:
-            detected = detect_system_proxy()
+            detected = _detect_system_proxy_cached()
             if detected:
                 proxy = detected
                 self.proxy_entry.delete(0, "end")
@@ -857,8 +993,7 @@ class App(ctk.CTk):
             self._log_to_current(f"[*] 使用代理: {proxy}")
 
     def _log_to_current(self, msg: str):
-        current = self.tabview.get()
-        task = self._tabs.get(current)
+        task = self._current_task
         if task:
             task.log_text.configure(state="normal")
             task.log_text.insert("end", msg + "\n")
@@ -866,8 +1001,32 @@ class App(ctk.CTk):
             task.log_text.configure(state="disabled")
 
     def _on_detect_proxy(self):
-        self._log_to_current("[*] 正在检测系统代理...")
-        detected = detect_system_proxy()
+        self._log_to_current("[*] 正在检测系统代理 / DNS / Clash API ...")
+
+        def probe_dns():
+            poisoned = _is_dns_poisoned("www.ting13.cc")
+            return poisoned, resolve_via_doh("www.ting13.cc") if poisoned else None
+
+        def probe_clash():
+            rotator = ClashRotator()
+            if rotator.auto_detect():
+                return rotator, rotator.load_nodes()
+            return None, []
+
+        def worker():
+            # 三个探测互不依赖, 并行跑完再一次性回主线程渲染,
+            # 总耗时从三项之和降到最慢一项
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                f_proxy = pool.submit(_detect_system_proxy_cached)
+                f_dns = pool.submit(probe_dns)
+                f_clash = pool.submit(probe_clash)
+                results = (f_proxy.result(), f_dns.result(), f_clash.result())
+            self.after(0, lambda: self._render_detect(*results))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _render_detect(self, detected, dns_result, clash_result):
+        """检测结果回主线程后统一写 UI"""
         if detected:
             self.proxy_entry.delete(0, "end")
             self.proxy_entry.insert(0, detected)
@@ -877,17 +1036,14 @@ class App(ctk.CTk):
             messagebox.showinfo("提示", "未检测到系统代理。\n请确认 Clash Verge 已开启「系统代理」。")
             return
 
-        self._log_to_current("[*] 正在检测 DNS 状态...")
-        if _is_dns_poisoned("www.ting13.cc"):
-            real_ip = resolve_via_doh("www.ting13.cc")
+        poisoned, real_ip = dns_result
+        if poisoned:
             self._log_to_current(f"[!] DNS 被污染! 真实 IP: {real_ip}")
         else:
             self._log_to_current("[OK] DNS 正常")
 
-        self._log_to_current("[*] 正在检测 Clash API...")
-        rotator = ClashRotator()
-        if rotator.auto_detect():
-            nodes = rotator.load_nodes()
+        rotator, nodes = clash_result
+        if rotator is not None:
             if nodes:
                 self.clash_rotator = rotator
                 self._rotate_var.set(True)
@@ -904,8 +1060,15 @@ class App(ctk.CTk):
 
     # ── 登录 ──
 
+    def _has_cookies_cached(self) -> bool:
+        # has_cookies() 每次都要查 cookie 文件; UI 刷新走内存标志,
+        # 登录/退出路径负责把标志置脏
+        if self._logged_in is None:
+            self._logged_in = has_cookies()
+        return self._logged_in
+
     def _update_login_status(self):
-        if has_cookies():
+        if self._has_cookies_cached():
             self.login_btn.configure(
                 text="已登录", fg_color="#2B7A0B", hover_color="#1E5A08",
             )
@@ -914,41 +1077,119 @@ class App(ctk.CTk):
                 text="未登录", fg_color="#555555", hover_color="#666666",
             )
 
+    def _ask_choice(self, title: str, message: str,
+                    yes_text: str = "是", no_text: str = "否") -> Optional[bool]:
+        """三态选择框 — 代替原生 askyesnocancel
+
+        原生模态框会卡住 Tk 事件循环, 弹窗期间所有页签的日志/进度
+        都停摆; wait_window 等待时事件循环照常泵, 下载 UI 不冻结。
+        """
+        result: list = [None]
+        dlg = ctk.CTkToplevel(self)
+        dlg.title(title)
+        dlg.grab_set()  # 挡住重复点击, 但不挡事件循环
+        ctk.CTkLabel(dlg, text=message, justify="left").pack(
+            padx=20, pady=(16, 10))
+        row = ctk.CTkFrame(dlg, fg_color="transparent")
+        row.pack(pady=(0, 14))
+
+        def _pick(v):
+            result[0] = v
+            dlg.destroy()
+
+        ctk.CTkButton(row, text=yes_text, width=80,
+                      command=lambda: _pick(True)).pack(side="left", padx=4)
+        ctk.CTkButton(row, text=no_text, width=80,
+                      command=lambda: _pick(False)).pack(side="left", padx=4)
+        ctk.CTkButton(row, text="取消", width=80,
+                      fg_color="#555555", hover_color="#666666",
+                      command=lambda: _pick(None)).pack(side="left", padx=4)
+        dlg.protocol("WM_DELETE_WINDOW", lambda: _pick(None))
+        self.wait_window(dlg)
+        return result[0]
+
     def _on_login(self):
-        if has_cookies():
-            choice = messagebox.askyesnocancel(
-                "登录状态",
-                "当前已登录。\n\n"
-                "点击「是」重新登录\n"
-                "点击「否」退出登录\n"
-                "点击「取消」返回"
+        if self._has_cookies_cached():
+            choice = self._ask_choice(
+                "登录状态", "当前已登录。",
+                yes_text="重新登录", no_text="退出登录",
             )
             if choice is True:
                 clear_cookies()
+                self._logged_in = False
                 self._update_login_status()
                 self._do_login()
             elif choice is False:
                 clear_cookies()
+                self._logged_in = False
                 self._update_login_status()
                 self._log_to_current("[*] 已退出登录")
             return
-        self._do_login()
+        choice = self._ask_choice(
+            "登录方式", "选择登录方式:",
+            yes_text="浏览器登录", no_text="粘贴 Cookie",
+        )
+        if choice is True:
+            self._do_login()
+        elif choice is False:
+            self._paste_cookie_dialog()
+
+    def _paste_cookie_dialog(self):
+        # 轻量登录通道: 粘贴浏览器里复制的 Cookie 串,
+        # 跳过整个 Chromium 启动 (约 1-2 秒 + 数百 MB 内存)
+        win = ctk.CTkToplevel(self)
+        win.title("粘贴 Cookie")
+        win.geometry("480x200")
+        win.grab_set()
+        ctk.CTkLabel(
+            win, text="粘贴浏览器中 ting13.cc 的 Cookie (格式: name=value; name2=value2):"
+        ).pack(padx=12, pady=(12, 4), anchor="w")
+        box = ctk.CTkTextbox(win, height=80)
+        box.pack(fill="x", padx=12)
+
+        def on_ok():
+            raw = box.get("1.0", "end").strip()
+            win.destroy()
+            count = self._save_pasted_cookies(raw)
+            if count:
+                self._log_to_current(f"[OK] 已保存 {count} 个 cookies")
+            else:
+                self._log_to_current("[!] 未解析到有效 Cookie")
+            self._logged_in = None
+            self._update_login_status()
+
+        ctk.CTkButton(win, text="确定", width=80, command=on_ok).pack(pady=10)
+
+    @staticmethod
+    def _save_pasted_cookies(raw: str) -> int:
+        """把 name=value; ... 形式的 Cookie 串转成 Playwright 格式并保存"""
+        cookies = []
+        for part in raw.split(";"):
+            name, sep, value = part.strip().partition("=")
+            if sep and name:
+                cookies.append({
+                    "name": name.strip(), "value": value.strip(),
+                    "domain": ".ting13.cc", "path": "/",
+                })
+        if cookies:
+            save_cookies(cookies)
+        return len(cookies)
 
     def _do_login(self):
         self._log_to_current("[*] 正在打开浏览器，请在浏览器中登录 ting13.cc ...")
 
         def worker():
+            # 整个登录只剩一次事件等待 + 一次 cookies() 调用,
+            # 独占一条 daemon 线程阻塞即可, 不必上 async API
             try:
+                # 延迟导入: playwright 包体积大, 只在真正登录时加载
+                from playwright.sync_api import sync_playwright
+                from ting13.core.utils import get_chrome_exe_path
                 with sync_playwright() as pw:
                     launch_kwargs: Dict = {"headless": False}
-                    if _is_frozen():
-                        base = _get_bundled_base()
-                        chrome_exe = os.path.join(
-                            base, "ms-playwright", "chromium-1208",
-                            "chrome-win64", "chrome.exe"
-                        )
-                        if os.path.isfile(chrome_exe):
-                            launch_kwargs["executable_path"] = chrome_exe
+                    chrome_exe = get_chrome_exe_path()
+                    if chrome_exe:
+                        launch_kwargs["executable_path"] = chrome_exe
                     if get_proxy():
                         launch_kwargs["proxy"] = {"server": get_proxy()}
                     browser = pw.chromium.launch(**launch_kwargs)
@@ -960,30 +1201,29 @@ class App(ctk.CTk):
                     )
                     self._log_to_current("[*] 浏览器已打开，请登录后关闭浏览器窗口")
 
+                    # 事件驱动等待: 离开登录页即视为登录完成,
+                    # 避免每秒一次 context.cookies() 的 IPC 轮询
                     logged_in = False
-                    for _ in range(600):
-                        try:
-                            _ = page.url
-                        except Exception:
-                            break
-                        cookies = context.cookies()
-                        has_session = any(
-                            c.get("name") in ("PHPSESSID", "user_token", "token", "uid")
-                            or "user" in c.get("name", "").lower()
-                            for c in cookies
-                        )
-                        if has_session:
-                            current_url = page.url
-                            if "login" not in current_url:
-                                logged_in = True
-                                break
-                        page.wait_for_timeout(1000)
+                    try:
+                        page.wait_for_url(
+                            lambda u: "login" not in u, timeout=600_000)
+                        logged_in = True
+                    except Exception:
+                        pass  # 超时或用户直接关窗口
 
                     try:
                         cookies = context.cookies()
                     except Exception:
                         cookies = []
 
+                    if logged_in:
+                        from ting13.sources.ting13 import Ting13Source
+                        names = {c.get("name") or "" for c in cookies}
+                        logged_in = bool(
+                            Ting13Source.SESSION_COOKIE_NAMES & names
+                            or any("user" in n.casefold() for n in names)
+                        )
+
                     if cookies:
                         save_cookies(cookies)
                         self._log_to_current(f"[OK] 已保存 {len(cookies)} 个 cookies")
@@ -999,6 +1239,7 @@ class App(ctk.CTk):
             except Exception as e:
                 self._log_to_current(f"[FAIL] 登录流程出错: {e}")
             finally:
+                self._logged_in = None  # worker 里存过 cookies, 置脏重查
                 self.after(100, self._update_login_status)
 
         t = threading.Thread(target=worker, daemon=True)
@@ -1006,13 +1247,97 @@ class App(ctk.CTk):
 
     # ── 全局轮询 ──
 
-    def _poll_all(self):
-        for task in list(self._tabs.values()):
+    def _pump_queue(self):
+        """后台线程: 阻塞读共享队列, 收到消息后经虚拟事件唤醒 Tk 主循环
+
+        event_generate 是少数线程安全的 Tk 调用; 消息本体放 deque
+        (两端操作原子), 主线程在事件回调里成批取走。
+        """
+        while True:
+            try:
+                msg = self.shared_queue.get()
+            except (EOFError, OSError):
+                return
+            self._pending_msgs.append(msg)
+            # 突发消息只唤醒一次: 把已经到队的消息顺手带走再发事件
+            try:
+                while True:
+                    self._pending_msgs.append(self.shared_queue.get_nowait())
+            except queue.Empty:
+                pass
+            except (EOFError, OSError):
+                return
+            try:
+                self.event_generate("<<WorkerMsg>>", when="tail")
+            except Exception:
+                return  # 窗口已销毁
+
+    def _on_worker_msg(self, _event=None):
+        # 一次事件清空积压, 按 tab_id 前缀分发。
+        # progress/status/info 同类只留每页签最新一条 (旧值已过时),
+        # 快速 CDN 下载时每章几十条进度消息只触发一次重绘;
+        # 日志按页签攒起来, 一次 drain 只做一次 insert
+        latest: Dict[str, dict] = {}
+        logs: Dict[str, list] = {}
+        while self._pending_msgs:
+            msg = self._pending_msgs.popleft()
+            task = self._tabs_by_id.get(msg[0])
+            if task is None:
+                # 页签已关闭, 丢弃残留消息; 共享内存结果要先释放 —
+                # apply_message 是唯一 unlink 的地方, 这里不清理段就漏了
+                if msg[1] == "result_shm":
+                    try:
+                        shm = shared_memory.SharedMemory(name=msg[3])
+                        shm.close()
+                        shm.unlink()
+                    except Exception:
+                        pass
+                continue
+            kind = msg[1]
+            if kind in ("progress", "status", "info"):
+                latest.setdefault(msg[0], {})[kind] = msg[1:]
+                continue
+            if kind == "log":
+                logs.setdefault(msg[0], []).append(msg[2])
+                continue
+            if kind == "log_batch":
+                logs.setdefault(msg[0], []).extend(msg[2])
+                continue
+            try:
+                task.apply_message(msg[1:])
+            except Exception:
+                pass
+
+        for tab_id, lines in logs.items():
+            task = self._tabs_by_id.get(tab_id)
+            if task is None:
+                continue
+            try:
+                task.apply_message(("log_batch", lines))
+            except Exception:
+                pass
+
+        for tab_id, kinds in latest.items():
+            task = self._tabs_by_id.get(tab_id)
+            if task is None:
+                continue
+            for m in kinds.values():
+                try:
+                    task.apply_message(m)
+                except Exception:
+                    pass
+
+    def _poll_finished(self):
+        # 任务完成与否没有队列消息可等, 保留一个轮询收尾;
+        # 间隔自适应: 有任务在跑时 200ms 收尾更及时, 全部空闲退到 1s
+        for task in list(self._active_tasks):
             try:
-                task.poll_queue()
+                task.check_finished()
             except Exception:
                 pass
-        self.after(80, self._poll_all)
+            if task._async_result is None:
+                self._active_tasks.discard(task)
+        self.after(200 if self._active_tasks else 1000, self._poll_finished)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -8,7 +8,7 @@ core - 核心基础设施模块
 from .models import Chapter, BookInfo
 from .network import (
     set_proxy, get_proxy, detect_system_proxy,
-    build_session, ClashRotator,
+    build_session, get_session, ClashRotator,
 )
 from .download import DownloadEngine, DownloadCallbacks, is_valid_audio_url
 from .utils import sanitize_filename
@@ -16,7 +16,7 @@ from .utils import sanitize_filename
 __all__ = [
     "Chapter", "BookInfo",
     "set_proxy", "get_proxy", "detect_system_proxy",
-    "build_session", "ClashRotator",
+    "build_session", "get_session", "ClashRotator",
     "DownloadEngine", "DownloadCallbacks",
     "sanitize_filename",
 ]
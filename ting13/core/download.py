@@ -12,13 +12,27 @@
 GUI 和 CLI 都使用这个引擎, 只需传入不同的回调函数即可。
 """
 
+import asyncio
 import os
 import random
+import re
+import shutil
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from queue import Empty, SimpleQueue
+from urllib.parse import urlparse
 from dataclasses import dataclass, field
 from typing import Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
+# orjson 序列化比 stdlib 快数倍 (可选, 没装就退回 json)
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+from . import download_async
 from .models import BookInfo, Chapter
 from .network import build_session, get_proxy, ClashRotator, random_ua
 from .utils import sanitize_filename
@@ -44,6 +58,9 @@ class DownloadCallbacks:
     on_info: Callable[[str], None] = lambda text: None
     on_progress: Callable[[float, str], None] = lambda val, label: None
     is_stopped: Callable[[], bool] = lambda: False
+    # 可选: 停止时 set() 此事件, 让引擎的长 sleep 立即醒来
+    # (不 set 也没关系, sleep 仍按秒轮询 is_stopped)
+    stop_event: threading.Event = field(default_factory=threading.Event)
 
 
 # ══════════════════════════════════════════════════════════════
@@ -56,6 +73,13 @@ _INVALID_AUDIO_URLS = [
     "MTaudio2024.js", "PTingJplayer.js", "MTingJplayer.js",
 ]
 
+# 黑名单 + 页面扩展名合成一条正则: 每章只扫一遍 URL,
+# 不再循环 N 次 substring + 每次 .lower() 分配
+_INVALID_RE = re.compile(
+    "|".join(map(re.escape, _INVALID_AUDIO_URLS)) + r"|\.(?:php|html?|js)$",
+    re.IGNORECASE,
+)
+
 # 音频文件的最小有效大小 (50 KB)
 MIN_AUDIO_SIZE = 50 * 1024
 
@@ -69,24 +93,46 @@ def is_valid_audio_url(url: str) -> bool:
     """
     if not url:
         return False
-    url_lower = url.lower()
-    for bad in _INVALID_AUDIO_URLS:
-        if bad.lower() in url_lower:
-            return False
-    # 纯 PHP/HTML 路径, 没有音频扩展名 → 大概率不是音频
-    if url_lower.endswith((".php", ".html", ".htm", ".js")):
-        return False
-    return True
+    # 命中黑名单或纯 PHP/HTML/JS 路径 → 大概率不是音频
+    return _INVALID_RE.search(url) is None
+
 
+# 音频扩展名 — 只认路径段末尾的扩展 (查询串里混进 ".mp3" 不算)
+_EXT_RE = re.compile(r"\.(?:m4a|aac|mp3)(?=$|[?#&/])", re.IGNORECASE)
 
 # CDN 域名白名单 — 这些域名不走代理, 直连更快
 _CDN_DOMAINS = ["xmcdn.com", "cos.tx.", "cdn.", "clouddn.com"]
+_CDN_RE = re.compile("|".join(map(re.escape, _CDN_DOMAINS)), re.IGNORECASE)
 
 
 def _is_cdn_url(url: str) -> bool:
     """判断 URL 是否指向 CDN (可跳过代理)"""
-    url_lower = url.lower()
-    return any(d in url_lower for d in _CDN_DOMAINS)
+    return _CDN_RE.search(url) is not None
+
+
+# 每条下载线程各自缓存 Session (按 referer + 是否走代理区分),
+# 章节之间复用 keep-alive 连接, 免去每个文件一次 TCP+TLS 握手
+_thread_local = threading.local()
+
+
+def _get_dl_session(referer: str, use_proxy: bool):
+    cache = getattr(_thread_local, "sessions", None)
+    if cache is None:
+        cache = _thread_local.sessions = {}
+    key = (referer, use_proxy)
+    sess = cache.get(key)
+    if sess is None:
+        if use_proxy:
+            sess = build_session(referer=referer)
+        else:
+            sess = build_session(referer=referer, proxy="__none__")
+        cache[key] = sess
+    return sess
+
+
+def _looks_like_html(head: bytes) -> bool:
+    """首块字节像 HTML/JS/JSON 错误页 (而不是音频帧)"""
+    return head.lstrip()[:1].startswith((b"<", b"{"))
 
 
 def download_file(
@@ -115,26 +161,79 @@ def download_file(
 
     # CDN 直连: 跳过代理, 减少一跳延迟
     use_proxy = not (cdn_direct and _is_cdn_url(url))
-    if use_proxy:
-        session = build_session(referer=referer)
-    else:
-        session = build_session(referer=referer, proxy="__none__")
+    session = _get_dl_session(referer, use_proxy)
 
     tmp_path = filepath + ".tmp"
 
     try:
-        resp = session.get(url, stream=True, timeout=60, verify=False)
+        # 音频本身已压缩, identity 省掉服务端 gzip 开销,
+        # 也让 content-length 和落盘字节数可直接比较
+        resp = session.get(url, stream=True, timeout=60, verify=False,
+                           headers={"Accept-Encoding": "identity"})
         resp.raise_for_status()
+
+        # 响应头直接暴露错误页的, 一个字节都不落盘
+        ct = resp.headers.get("content-type", "").lower()
+        if "text/html" in ct or "javascript" in ct:
+            resp.close()
+            return False
+
         total = int(resp.headers.get("content-length", 0))
 
         downloaded = 0
         with open(tmp_path, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=65536):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if progress_callback and total:
-                        progress_callback(downloaded, total)
+            # Content-Length 已知时先预分配整段 (Linux):
+            # 文件系统一次划好连续 extent, 少碎片少元数据日志,
+            # 磁盘不够也能在下载前就失败; Windows 没有此调用, 跳过
+            preallocated = False
+            if total and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(f.fileno(), 0, total)
+                    preallocated = True
+                except OSError:
+                    pass
+
+            if progress_callback and total:
+                # 需要进度回调时按 1MB 大块迭代, 比 64KB 少走十几倍的
+                # Python 帧 + write 系统调用
+                # 进度条只有 ~100 个像素, 回调按 ≥1% (或 256KB) 步进足够
+                last_emit = 0
+                step = max(total // 100, 256 * 1024)
+                for chunk in resp.iter_content(chunk_size=1024 * 1024):
+                    if chunk:
+                        # 首块嗅探: 错误页在第一块就拒收 (交给 except 清理)
+                        if downloaded == 0 and _looks_like_html(chunk):
+                            raise ValueError("非音频响应")
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if downloaded - last_emit >= step:
+                            progress_callback(downloaded, total)
+                            last_emit = downloaded
+                # 收尾必发一次, 保证进度条走到 100%
+                if downloaded > last_emit:
+                    progress_callback(downloaded, total)
+            else:
+                # 无回调 (引擎主路径): 先嗅探首块, 剩余让 copyfileobj 在 C 层搬运
+                resp.raw.decode_content = True
+                head = resp.raw.read(1024 * 1024)
+                if _looks_like_html(head):
+                    raise ValueError("非音频响应")
+                f.write(head)
+                shutil.copyfileobj(resp.raw, f, length=1024 * 1024)
+                downloaded = f.tell()
+
+            # 实际字节数少于预分配长度时截掉尾部的零填充
+            if preallocated and downloaded < total:
+                f.truncate(downloaded)
+
+            # Linux 下提示内核别缓存刚写完的音频 (一次性写入, 不会回读);
+            # Windows 没有这个调用, hasattr 守护直接跳过
+            if hasattr(os, "posix_fadvise"):
+                try:
+                    f.flush()
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+                except OSError:
+                    pass
 
         # 验证文件完整性
         if total and downloaded < total * 0.95:
@@ -162,7 +261,6 @@ def download_cover(cover_url: str, save_dir: str, referer: str = "") -> Optional
     """下载封面图片"""
     if not cover_url:
         return None
-    from urllib.parse import urlparse
     ext = os.path.splitext(urlparse(cover_url).path)[1] or ".jpg"
     filepath = os.path.join(save_dir, f"cover{ext}")
     if os.path.exists(filepath):
@@ -177,13 +275,18 @@ def download_cover(cover_url: str, save_dir: str, referer: str = "") -> Optional
 # ══════════════════════════════════════════════════════════════
 
 def scan_downloaded(book_dir: str) -> set:
-    """扫描目录中已下载的章节编号 (根据文件名前缀 0001_)"""
+    """扫描目录中已下载的章节编号 (根据文件名前缀 0001_)
+
+    scandir 边读边出, 不用先物化整个文件名列表;
+    partition 也比 split 少一次 list 分配。
+    """
     downloaded = set()
     try:
-        for f in os.listdir(book_dir):
-            parts = f.split("_", 1)
-            if parts[0].isdigit():
-                downloaded.add(int(parts[0]))
+        with os.scandir(book_dir) as it:
+            for entry in it:
+                prefix, _, _ = entry.name.partition("_")
+                if prefix.isdigit():
+                    downloaded.add(int(prefix))
     except OSError:
         pass
     return downloaded
@@ -209,8 +312,11 @@ def reorder_with_gaps_first(
     min_dl = min(downloaded_indices)
     max_dl = max(downloaded_indices)
 
-    gaps = [ch for ch in chapters if min_dl <= ch.index <= max_dl]
-    continuations = [ch for ch in chapters if ch.index > max_dl or ch.index < min_dl]
+    # 单次遍历分桶, 不用两个推导式各扫一遍
+    gaps: List[Chapter] = []
+    continuations: List[Chapter] = []
+    for ch in chapters:
+        (gaps if min_dl <= ch.index <= max_dl else continuations).append(ch)
 
     if gaps:
         return gaps + continuations
@@ -234,8 +340,14 @@ class DownloadEngine:
 
     # 默认换 IP 间隔 (章数)
     DEFAULT_ROTATE_INTERVAL = 15
-    # 并行下载线程数
+    # 并行下载线程数 (起始值; 连续成功会逐步加到上限, 出错减半)
     DOWNLOAD_WORKERS = 3
+    # 自适应并发上限
+    DOWNLOAD_WORKERS_MAX = 8
+    # 连续成功多少章后 +1 并发
+    WORKERS_RAMP_AFTER = 10
+    # URL 预取深度 (同时在途的 API 预取数)
+    PREFETCH_DEPTH = 2
 
     def __init__(
         self,
@@ -243,10 +355,23 @@ class DownloadEngine:
         callbacks: DownloadCallbacks,
         clash_rotator: Optional[ClashRotator] = None,
         rotate_interval: int = 0,
+        download_workers: int = 0,
     ):
         self.source = source
         self.cb = callbacks
         self.clash_rotator = clash_rotator
+        # 下载并发度 (0 = 用类默认值; GUI 可让用户调)
+        # 运行中自适应: 这是起始值和下限, 上限是 DOWNLOAD_WORKERS_MAX
+        self.download_workers = download_workers or self.DOWNLOAD_WORKERS
+        self._dl_workers_floor = self.download_workers
+        self._dl_workers_max = max(self.download_workers,
+                                   self.DOWNLOAD_WORKERS_MAX)
+        self._dl_ok_streak = 0
+        # 下载任务内部重试不会以失败收割 (最终不是成功就是被停止),
+        # 每次失败尝试记到共享计数器上, 调谐器读增量来踩刹车
+        self._dl_retry_count = 0
+        self._dl_retry_seen = 0
+        self._dl_retry_lock = threading.Lock()
         # 如果用户没有设置, 且有 Clash, 则使用默认间隔
         if rotate_interval > 0:
             self.rotate_interval = rotate_interval
@@ -260,15 +385,30 @@ class DownloadEngine:
         self._consecutive_fail = 0
         self._rate_limit_count = 0
 
-        # URL 预取 (单线程, 仅轻量 API 调用)
-        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
-        self._prefetch_future: Optional[Future] = None
-        self._prefetch_chapter_idx: int = -1
-
-        # 并行下载池 (CDN 不限流, 可多线程)
-        self._dl_pool = ThreadPoolExecutor(max_workers=self.DOWNLOAD_WORKERS)
+        # URL 预取 (仅轻量 API 调用); 深度 >1 让多个 API 往返互相重叠
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=self.PREFETCH_DEPTH)
+        self._prefetch_futures: Dict[int, Future] = {}
+
+        # 并行下载: aiohttp 可用时用单线程事件循环并发下载 (省线程切换,
+        # 连接池跨章节复用), 否则回退到线程池 (CDN 不限流, 可多线程)
+        # 池子按上限开, 实际并发由主循环的背压 (download_workers) 控制
+        if download_async.aiohttp_available():
+            self._aio_loop: Optional[download_async.AsyncDownloadLoop] = \
+                download_async.AsyncDownloadLoop(self._dl_workers_max)
+            self._dl_pool: Optional[ThreadPoolExecutor] = None
+        else:
+            self._aio_loop = None
+            self._dl_pool = ThreadPoolExecutor(max_workers=self._dl_workers_max)
         # 待完成的下载任务: chapter_index → (Chapter, filename, Future)
         self._pending_dl: Dict[int, Tuple[Chapter, str, Future]] = {}
+        # 完成通知队列: done_callback 把章节编号塞进来,
+        # 收割时只拿通知, 不再逐个 Future 轮询 done()
+        self._done_q: SimpleQueue = SimpleQueue()
+        # 追加式进度日志句柄 (run() 内打开/关闭)
+        self._record_log = None
+        # 已落盘的章节编号 — 开始时扫一次目录, 之后下载成功就地更新,
+        # 免得每章循环都 listdir 整个目录
+        self._downloaded_idx: set = set()
 
         # 将 Clash 轮换器传递给 Source (用于验证码等场景)
         if clash_rotator and hasattr(source, 'set_clash_rotator'):
@@ -310,8 +450,9 @@ class DownloadEngine:
             if cover:
                 self.cb.on_log("[*] 封面已保存")
 
-        # 扫描已下载
-        downloaded_indices = scan_downloaded(book_dir)
+        # 扫描已下载 (整个 run 只扫这一次)
+        self._downloaded_idx = scan_downloaded(book_dir)
+        downloaded_indices = self._downloaded_idx
 
         # 过滤 + 重排
         missing = [ch for ch in chapters if ch.index not in downloaded_indices]
@@ -320,6 +461,14 @@ class DownloadEngine:
             self.cb.on_status("全部已下载")
             return
 
+        # 追加式进度日志: 每下载成功一章就写一行,
+        # 进程中途被杀也能留下本次会话的记录
+        try:
+            self._record_log = open(
+                os.path.join(book_dir, "download_record.jsonl"), "ab")
+        except OSError:
+            self._record_log = None
+
         skipped = len(chapters) - len(missing)
         if skipped:
             self.cb.on_log(f"[*] 跳过已下载: {skipped} 集")
@@ -345,7 +494,7 @@ class DownloadEngine:
             )
 
         self.cb.on_log(
-            f"[*] 并行模式: {self.DOWNLOAD_WORKERS} 线程下载 + "
+            f"[*] 并行模式: {self.download_workers} 线程下载 + "
             f"URL预取 + CDN直连 + 自适应延迟\n"
         )
 
@@ -366,14 +515,18 @@ class DownloadEngine:
                 s, f = self._collect_completed()
                 success += s
                 fail += f
+                self._tune_workers(s, f)
 
-                # 控制并发: 如果满了, 等一个完成
-                while (len(self._pending_dl) >= self.DOWNLOAD_WORKERS
+                # 控制并发: 如果满了, 阻塞到任意一个完成
+                # (带超时, 保证 stop 请求仍能及时响应)
+                while (len(self._pending_dl) >= self.download_workers
                        and not self.cb.is_stopped()):
-                    time.sleep(0.2)
+                    wait([t[2] for t in self._pending_dl.values()],
+                         timeout=0.5, return_when=FIRST_COMPLETED)
                     s, f = self._collect_completed()
                     success += s
                     fail += f
+                    self._tune_workers(s, f)
 
                 progress = (success + fail) / total
                 self.cb.on_progress(progress, f"{success + fail}/{total}")
@@ -381,16 +534,8 @@ class DownloadEngine:
                 self.cb.on_log(f"[{i + 1}/{total}] {chapter.title}")
 
                 # 二次检查是否已下载 (防并发)
-                try:
-                    existing = [
-                        f for f in os.listdir(book_dir)
-                        if f.startswith(f"{chapter.index:04d}_")
-                    ]
-                except OSError:
-                    existing = []
-
-                if existing:
-                    self.cb.on_log(f"  [SKIP] 已存在: {existing[0]}")
+                if chapter.index in self._downloaded_idx:
+                    self.cb.on_log(f"  [SKIP] 已存在: 第 {chapter.index:04d} 集")
                     success += 1
                     continue
 
@@ -416,12 +561,9 @@ class DownloadEngine:
                 short_url = audio_url[:70] + "..." if len(audio_url) > 70 else audio_url
                 self.cb.on_log(f"  [OK] {short_url}")
 
-                # 确定扩展名
-                ext = ".mp3"
-                for fmt in [(".m4a", ".m4a"), (".aac", ".aac"), (".mp3", ".mp3")]:
-                    if fmt[0] in audio_url:
-                        ext = fmt[1]
-                        break
+                # 确定扩展名 (取 URL path 部分, 一次正则扫描)
+                m = _EXT_RE.search(urlparse(audio_url).path)
+                ext = m.group(0).lower() if m else ".mp3"
 
                 filename = f"{chapter.index:04d}_{sanitize_filename(chapter.title)}{ext}"
                 filepath = os.path.join(book_dir, filename)
@@ -429,10 +571,18 @@ class DownloadEngine:
                 # ── 提交下载到线程池 (非阻塞) ──
                 cdn_tag = " (CDN直连)" if _is_cdn_url(audio_url) else ""
                 self.cb.on_log(f"  [>>] 提交下载: {filename}{cdn_tag}")
-                future = self._dl_pool.submit(
-                    self._download_task, chapter, audio_url,
-                    filepath, filename, self.source.base_url,
-                )
+                if self._aio_loop is not None:
+                    future = self._aio_loop.submit(self._download_task_async(
+                        chapter, audio_url, filepath, filename,
+                        self.source.base_url,
+                    ))
+                else:
+                    future = self._dl_pool.submit(
+                        self._download_task, chapter, audio_url,
+                        filepath, filename, self.source.base_url,
+                    )
+                future.add_done_callback(
+                    lambda f, idx=chapter.index: self._done_q.put(idx))
                 self._pending_dl[chapter.index] = (chapter, filename, future)
 
                 # ── 启动预取下一章 URL ──
@@ -447,15 +597,25 @@ class DownloadEngine:
                     f"\n[*] 等待 {len(self._pending_dl)} 个下载完成..."
                 )
             while self._pending_dl and not self.cb.is_stopped():
-                time.sleep(0.5)
+                wait([t[2] for t in self._pending_dl.values()],
+                     timeout=1.0, return_when=FIRST_COMPLETED)
                 s, f = self._collect_completed()
                 success += s
                 fail += f
 
         finally:
+            if self._record_log is not None:
+                try:
+                    self._record_log.close()
+                except OSError:
+                    pass
+                self._record_log = None
             self._cancel_prefetch()
             self._prefetch_pool.shutdown(wait=False)
-            self._dl_pool.shutdown(wait=True)
+            if self._aio_loop is not None:
+                self._aio_loop.shutdown()
+            else:
+                self._dl_pool.shutdown(wait=True)
             self.source.after_download()
 
         self._save_record(book, chapters, book_dir)
@@ -499,29 +659,74 @@ class DownloadEngine:
                 return (True, fsize)
 
             # 重试
+            with self._dl_retry_lock:
+                self._dl_retry_count += 1
             if os.path.exists(filepath + ".tmp"):
                 try:
                     os.remove(filepath + ".tmp")
                 except OSError:
                     pass
 
-            wait = min(10 * dl_attempt, 60)
-            time.sleep(wait)
+            self._interruptible_sleep(min(10 * dl_attempt, 60))
+
+        return (False, 0)
+
+    async def _download_task_async(
+        self,
+        chapter: Chapter,
+        audio_url: str,
+        filepath: str,
+        filename: str,
+        referer: str,
+    ) -> Tuple[bool, int]:
+        """
+        在事件循环中执行的下载任务 (带无限重试), 语义同 _download_task
+
+        Returns:
+            (成功, 文件大小 KB)
+        """
+        use_proxy = not _is_cdn_url(audio_url)
+        dl_attempt = 0
+        while not self.cb.is_stopped():
+            dl_attempt += 1
+            ok = await self._aio_loop.fetch_file(
+                audio_url, filepath, referer=referer,
+                use_proxy=use_proxy, min_size=MIN_AUDIO_SIZE,
+            )
+            if ok:
+                fsize = os.path.getsize(filepath) // 1024
+                chapter.downloaded = True
+                return (True, fsize)
+
+            with self._dl_retry_lock:
+                self._dl_retry_count += 1
+            if os.path.exists(filepath + ".tmp"):
+                try:
+                    os.remove(filepath + ".tmp")
+                except OSError:
+                    pass
+
+            await asyncio.sleep(min(10 * dl_attempt, 60))
 
         return (False, 0)
 
     def _collect_completed(self) -> Tuple[int, int]:
         """收割已完成的下载任务, 返回 (成功数, 失败数)"""
-        done_keys = [
-            idx for idx, (_, _, fut) in self._pending_dl.items()
-            if fut.done()
-        ]
         s, f = 0, 0
-        for idx in done_keys:
-            chapter, filename, future = self._pending_dl.pop(idx)
+        while True:
+            try:
+                idx = self._done_q.get_nowait()
+            except Empty:
+                break
+            entry = self._pending_dl.pop(idx, None)
+            if entry is None:
+                continue
+            chapter, filename, future = entry
             try:
                 ok, fsize = future.result(timeout=0)
                 if ok:
+                    self._downloaded_idx.add(idx)
+                    self._append_record_line(chapter)
                     self.cb.on_log(f"  [OK] {filename} ({fsize} KB)")
                     s += 1
                 else:
@@ -532,6 +737,51 @@ class DownloadEngine:
                 f += 1
         return s, f
 
+    def _tune_workers(self, ok: int, failed: int):
+        """根据下载成败自适应调节并发度
+
+        CDN 不限流时逐步加压直到上限; 一旦出现失败 (限流/连接被重
+        置) 立即减半回下限附近, 避免在临界点上来回震荡。
+        任务内部的重试也算失败 — 收割结果几乎总是"成功",
+        刹车信号主要来自重试计数器的增量。
+        """
+        retries = self._dl_retry_count
+        failed += retries - self._dl_retry_seen
+        self._dl_retry_seen = retries
+        if failed:
+            if self.download_workers > self._dl_workers_floor:
+                self.download_workers = max(
+                    self._dl_workers_floor, self.download_workers // 2)
+                self.cb.on_log(
+                    f"  [*] 下载出错, 并发降至 {self.download_workers}")
+            self._dl_ok_streak = 0
+            return
+        self._dl_ok_streak += ok
+        if (self._dl_ok_streak >= self.WORKERS_RAMP_AFTER
+                and self.download_workers < self._dl_workers_max):
+            self.download_workers += 1
+            self._dl_ok_streak = 0
+
+    def _append_record_line(self, chapter: Chapter):
+        """追加一条下载成功记录到 JSONL (每行一个章节, 即时落盘)"""
+        if self._record_log is None:
+            return
+        entry = {
+            "index": chapter.index,
+            "title": chapter.title,
+            "audio_url": chapter.audio_url,
+        }
+        try:
+            if _HAS_ORJSON:
+                line = orjson.dumps(entry)
+            else:
+                import json
+                line = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+            self._record_log.write(line + b"\n")
+            self._record_log.flush()
+        except OSError:
+            pass
+
     # ══════════════════════════════════════════════════════════════
     # URL 预取流水线
     # ══════════════════════════════════════════════════════════════
@@ -545,36 +795,25 @@ class DownloadEngine:
 
     def _start_prefetch(self, chapters: List[Chapter], next_i: int,
                         book_dir: str):
-        """启动对下一章的 URL 预取 (非阻塞)"""
-        if next_i >= len(chapters):
-            return
-        next_ch = chapters[next_i]
-        try:
-            existing = [
-                f for f in os.listdir(book_dir)
-                if f.startswith(f"{next_ch.index:04d}_")
-            ]
-            if existing:
-                return
-        except OSError:
-            pass
-
-        self._prefetch_chapter_idx = next_ch.index
-        self._prefetch_future = self._prefetch_pool.submit(
-            self._prefetch_url, next_ch,
-        )
+        """预取后续章节 URL (非阻塞), 保持最多 PREFETCH_DEPTH 个在途"""
+        j = next_i
+        while (j < len(chapters)
+               and len(self._prefetch_futures) < self.PREFETCH_DEPTH):
+            ch = chapters[j]
+            j += 1
+            if (ch.index in self._downloaded_idx
+                    or ch.index in self._prefetch_futures):
+                continue
+            self._prefetch_futures[ch.index] = self._prefetch_pool.submit(
+                self._prefetch_url, ch,
+            )
 
     def _consume_prefetch(self, chapter: Chapter) -> Optional[str]:
         """消费预取结果"""
-        if (self._prefetch_future is None
-                or self._prefetch_chapter_idx != chapter.index):
-            self._cancel_prefetch()
+        future = self._prefetch_futures.pop(chapter.index, None)
+        if future is None:
             return None
 
-        future = self._prefetch_future
-        self._prefetch_future = None
-        self._prefetch_chapter_idx = -1
-
         try:
             url = future.result(timeout=10)
             if url and url != "RATE_LIMITED" and is_valid_audio_url(url):
@@ -586,11 +825,11 @@ class DownloadEngine:
         return None
 
     def _cancel_prefetch(self):
-        """取消进行中的预取"""
-        if self._prefetch_future and not self._prefetch_future.done():
-            self._prefetch_future.cancel()
-        self._prefetch_future = None
-        self._prefetch_chapter_idx = -1
+        """取消所有在途预取"""
+        for future in self._prefetch_futures.values():
+            if not future.done():
+                future.cancel()
+        self._prefetch_futures.clear()
 
     # ══════════════════════════════════════════════════════════════
     # 获取 URL (带无限重试)
@@ -618,14 +857,16 @@ class DownloadEngine:
             self._consecutive_fail += 1
             self._consecutive_ok = 0
 
-            if attempt <= 2:
-                wait = 15
-            elif attempt <= 4:
-                wait = 30
+            # 源若从响应里拿到了服务器建议的等待秒数 (Retry-After 等),
+            # 直接按它睡; 否则指数退避 + 抖动 (5→10→20→40→60s 封顶)
+            hint = getattr(self.source, "retry_after_hint", None)
+            if hint:
+                wait = max(float(hint), 1.0) + random.uniform(0, 0.3 * float(hint))
             else:
-                wait = 60 + random.randint(0, 30)
+                base = min(60, 5 * 2 ** (attempt - 1))
+                wait = base + random.uniform(0, base * 0.3)
 
-            self.cb.on_log(f"  [!] 第{attempt}次失败, 等待 {wait}s...")
+            self.cb.on_log(f"  [!] 第{attempt}次失败, 等待 {wait:.0f}s...")
             self._interruptible_sleep(wait)
 
             if attempt % 2 == 0 and self.clash_rotator:
@@ -641,12 +882,17 @@ class DownloadEngine:
     # ══════════════════════════════════════════════════════════════
 
     def _interruptible_sleep(self, seconds):
-        """可被 stop 中断的 sleep"""
+        """可被 stop 中断的 sleep
+
+        stop_event 被 set 时立即返回; 同时仍按秒轮询 is_stopped,
+        兼容只提供 lambda 而不碰事件的调用方 (如多进程 worker)。
+        """
         end = time.time() + seconds
         while time.time() < end:
             if self.cb.is_stopped():
                 return
-            time.sleep(min(1.0, end - time.time()))
+            if self.cb.stop_event.wait(min(1.0, end - time.time())):
+                return
 
     def _anti_rate_limit_delay(self, i: int, total: int):
         """
@@ -714,5 +960,9 @@ class DownloadEngine:
             ],
         }
         record_path = os.path.join(book_dir, "download_record.json")
-        with open(record_path, "w", encoding="utf-8") as f:
-            json.dump(record, f, ensure_ascii=False, indent=2)
+        if _HAS_ORJSON:
+            with open(record_path, "wb") as f:
+                f.write(orjson.dumps(record, option=orjson.OPT_INDENT_2))
+        else:
+            with open(record_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,147 @@
+"""
+异步下载支持 — aiohttp 驱动的章节音频并发下载
+
+DownloadEngine 的文件下载默认走 ThreadPoolExecutor (3 线程阻塞 I/O)。
+安装 aiohttp 后, 引擎改用单线程事件循环 + aiohttp 并发连接:
+同样的并发度下省掉线程切换开销, 连接池和 DNS 缓存跨章节复用。
+
+aiohttp 为可选依赖, 未安装时引擎自动回退到线程池模式。
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+from .network import get_proxy, DEFAULT_UA
+
+# aiohttp 可选依赖 (未安装则回退线程池下载)
+try:
+    import aiohttp
+    _HAS_AIOHTTP = True
+except ImportError:
+    _HAS_AIOHTTP = False
+
+
+def aiohttp_available() -> bool:
+    """aiohttp 是否可用 (决定 DownloadEngine 的下载模式)"""
+    return _HAS_AIOHTTP
+
+
+class AsyncDownloadLoop:
+    """
+    后台线程中运行的 asyncio 事件循环, 供同步代码提交下载协程
+
+    submit() 返回 concurrent.futures.Future, 与 ThreadPoolExecutor.submit
+    的返回值接口一致 (done / result / cancel), 所以 DownloadEngine 的
+    收割逻辑不需要区分线程池和事件循环两种模式。
+    """
+
+    def __init__(self, concurrency: int = 8):
+        self._concurrency = concurrency
+        self._session: Optional["aiohttp.ClientSession"] = None
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="ting13-aio", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """把协程提交到后台事件循环, 返回线程安全的 Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _ensure_session(self) -> "aiohttp.ClientSession":
+        if self._session is None:
+            self._sem = asyncio.Semaphore(self._concurrency)
+            connector = aiohttp.TCPConnector(
+                limit=self._concurrency, ttl_dns_cache=300, ssl=False)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": DEFAULT_UA},
+            )
+        return self._session
+
+    async def fetch_file(
+        self,
+        url: str,
+        filepath: str,
+        *,
+        referer: str = "",
+        use_proxy: bool = True,
+        min_size: int = 0,
+    ) -> bool:
+        """
+        下载单个文件到 filepath (带临时文件保护 + 大小校验)
+
+        语义与 download.download_file 保持一致:
+        - 写入 .tmp 后 os.replace
+        - content-length 不足 95% 或小于 min_size 视为失败
+        """
+        if url.startswith("//"):
+            url = "https:" + url
+
+        session = await self._ensure_session()
+        proxy = get_proxy() if use_proxy else None
+        # aiohttp 只支持 http 代理
+        if proxy and not proxy.startswith("http"):
+            proxy = None
+
+        tmp_path = filepath + ".tmp"
+        try:
+            async with self._sem:
+                # 音频已压缩, identity 免掉服务端 gzip / 客户端解压
+                kwargs = {
+                    "timeout": aiohttp.ClientTimeout(total=600, sock_read=60),
+                    "headers": {"Accept-Encoding": "identity"},
+                }
+                if referer:
+                    kwargs["headers"]["Referer"] = referer
+                if proxy:
+                    kwargs["proxy"] = proxy
+                async with session.get(url, **kwargs) as resp:
+                    resp.raise_for_status()
+                    total = int(resp.headers.get("content-length", 0))
+
+                    downloaded = 0
+                    with open(tmp_path, "wb") as f:
+                        async for chunk in resp.content.iter_chunked(65536):
+                            if chunk:
+                                f.write(chunk)
+                                downloaded += len(chunk)
+
+            if total and downloaded < total * 0.95:
+                os.remove(tmp_path)
+                return False
+            if downloaded < min_size:
+                os.remove(tmp_path)
+                return False
+
+            os.replace(tmp_path, filepath)
+            return True
+
+        except Exception:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+    def shutdown(self):
+        """关闭 session 和事件循环 (阻塞至后台线程退出)"""
+        async def _close():
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout=5)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -6,7 +6,9 @@ from dataclasses import dataclass, field
 from typing import List, Optional
 
 
-@dataclass
+# slots=True (Python 3.10+): 几千章的书省掉每实例一个 __dict__,
+# 属性访问也更快; 跨进程 pickle 不受影响
+@dataclass(slots=True)
 class Chapter:
     """一个章节"""
     index: int          # 序号 (1-based)
@@ -20,7 +22,7 @@ class Chapter:
         return f"Chapter({self.index}, '{self.title}', audio={audio})"
 
 
-@dataclass
+@dataclass(slots=True)
 class BookInfo:
     """一本有声书"""
     title: str
@@ -5,10 +5,16 @@
 避免每个站点重复实现代理 / DNS / Clash 逻辑。
 """
 
+import atexit
+import json
 import os
+import random
 import re
 import ssl
 import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from urllib.parse import quote
 
@@ -20,6 +26,13 @@ from urllib3.util.retry import Retry
 # 禁用 SSL 未验证警告
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# orjson 解析比 stdlib 快数倍 (可选, 没装就退回 json)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 # ══════════════════════════════════════════════════════════════
 # 代理管理 (全局单例)
@@ -76,15 +89,24 @@ def detect_system_proxy() -> Optional[str]:
         if val:
             return val
 
-    # 3) 探测常见 Clash 端口
-    for port in (7890, 7891, 7897, 1080):
+    # 3) 探测常见 Clash 端口 — 并行连接, 没代理时只等一个超时周期
+    #    而不是逐个端口各等 0.5s; 结果仍按端口优先级取
+    ports = (7890, 7891, 7897, 1080)
+
+    def _probe(port: int) -> bool:
         try:
             s = socket.create_connection(("127.0.0.1", port), timeout=0.5)
             s.close()
+            return True
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        results = list(pool.map(_probe, ports))
+    for port, ok in zip(ports, results):
+        if ok:
             proto = "socks5" if port == 1080 else "http"
             return f"{proto}://127.0.0.1:{port}"
-        except Exception:
-            continue
 
     return None
 
@@ -93,32 +115,110 @@ def detect_system_proxy() -> Optional[str]:
 # DoH (DNS over HTTPS) — 防 DNS 污染
 # ══════════════════════════════════════════════════════════════
 
-_dns_cache: Dict[str, str] = {}
+# DoH 查询共用的长连接 Session: 复用 TCP+TLS 连接, 免每次握手
+_api_session = requests.Session()
+_api_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+_api_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# domain -> (ip, 过期时间戳); 跨进程复用走磁盘缓存
+# 批量解析/并发抓取会多线程读写, 写入和落盘快照都要拿锁
+_dns_cache: Dict[str, tuple] = {}
+_dns_lock = threading.Lock()
+_DNS_CACHE_TTL = 300
+_DNS_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".ting13_doh_cache.json")
+_dns_cache_loaded = False
+
+
+def _load_dns_cache():
+    """首次解析时把磁盘缓存读进来, 让重复的 GUI 检测/CLI 调用免去 DoH 往返"""
+    global _dns_cache_loaded
+    _dns_cache_loaded = True
+    try:
+        with open(_DNS_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        now = time.time()
+        with _dns_lock:
+            for host, ent in data.items():
+                if isinstance(ent, dict) and ent.get("exp", 0) > now:
+                    _dns_cache[host] = (ent["ip"], ent["exp"])
+    except (FileNotFoundError, json.JSONDecodeError, OSError, KeyError):
+        pass
+
+
+def _save_dns_cache():
+    # 先原子快照再序列化 — 并发解析的线程可能正在往缓存里插,
+    # 直接迭代会炸 "dictionary changed size during iteration"
+    with _dns_lock:
+        snapshot = dict(_dns_cache)
+    data = json.dumps(
+        {h: {"ip": ip, "exp": exp} for h, (ip, exp) in snapshot.items()},
+        ensure_ascii=False,
+    )
+    tmp = _DNS_CACHE_FILE + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, _DNS_CACHE_FILE)
+    except OSError:
+        pass
 
 
 def resolve_via_doh(domain: str) -> Optional[str]:
-    """通过 DoH 解析域名, 绕过本地 DNS 污染"""
-    if domain in _dns_cache:
-        return _dns_cache[domain]
+    """通过 DoH 解析域名, 绕过本地 DNS 污染 (结果带 TTL 缓存)"""
+    if not _dns_cache_loaded:
+        _load_dns_cache()
+    cached = _dns_cache.get(domain)
+    if cached and cached[1] > time.time():
+        return cached[0]
 
     doh_servers = [
         f"https://1.1.1.1/dns-query?name={domain}&type=A",
         f"https://8.8.8.8/resolve?name={domain}&type=A",
     ]
-    for url in doh_servers:
-        try:
-            resp = requests.get(
-                url, headers={"Accept": "application/dns-json"},
-                timeout=8, verify=False,
-            )
-            data = resp.json()
-            ips = [a["data"] for a in data.get("Answer", []) if a.get("type") == 1]
-            if ips:
-                _dns_cache[domain] = ips[0]
-                return ips[0]
-        except Exception:
-            continue
-    return None
+
+    def _query(url: str) -> Optional[tuple]:
+        resp = _api_session.get(
+            url, headers={"Accept": "application/dns-json"},
+            timeout=8, verify=False,
+        )
+        data = _json_loads(resp.content)
+        answers = [a for a in data.get("Answer", []) if a.get("type") == 1]
+        if not answers:
+            return None
+        # 按真实 DNS 语义取应答里的 TTL (限制在 1 分钟 ~ 1 小时)
+        ttl = min(int(answers[0].get("TTL", _DNS_CACHE_TTL)), 3600)
+        return answers[0]["data"], max(ttl, 60)
+
+    # 两个 DoH 服务并发竞速, 谁先答谁赢 —
+    # 串行时第一个服务被墙要白等满 8s 超时才轮到第二个。
+    # 注意不能用 with 管理池子: __exit__ 会 join 落后的查询,
+    # 赢家的结果就得等输家超时才能返回
+    pool = ThreadPoolExecutor(max_workers=len(doh_servers))
+    try:
+        futures = [pool.submit(_query, u) for u in doh_servers]
+        for fut in as_completed(futures):
+            try:
+                result = fut.result()
+            except Exception:
+                continue
+            if result:
+                ip, ttl = result
+                with _dns_lock:
+                    _dns_cache[domain] = (ip, time.time() + ttl)
+                _save_dns_cache()
+                return ip
+        return None
+    finally:
+        pool.shutdown(wait=False)
+
+
+def resolve_via_doh_batch(domains: List[str]) -> Dict[str, Optional[str]]:
+    """并发解析一批域名 — 耗时约等于最慢的一个, 结果照常进缓存"""
+    if not domains:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(8, len(domains))) as pool:
+        futures = {d: pool.submit(resolve_via_doh, d) for d in domains}
+        return {d: fut.result() for d, fut in futures.items()}
 
 
 def is_dns_poisoned(domain: str) -> bool:
@@ -160,7 +260,7 @@ DEFAULT_UA = (
 )
 
 # User-Agent 池 — 模拟不同浏览器/设备, 降低被识别为爬虫的概率
-_UA_POOL = [
+_UA_POOL = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
@@ -169,13 +269,12 @@ _UA_POOL = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-]
+)
 
 
 def random_ua() -> str:
     """从 UA 池中随机选取一个 User-Agent"""
-    import random as _rnd
-    return _rnd.choice(_UA_POOL)
+    return random.choice(_UA_POOL)
 
 MOBILE_UA = (
     "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) "
@@ -183,6 +282,10 @@ MOBILE_UA = (
     "Mobile/15E148 Safari/604.1"
 )
 
+# 默认重试策略 (Retry 不可变, 可安全跨 Session 共享)
+_DEFAULT_RETRY = Retry(total=3, backoff_factor=1,
+                       status_forcelist=[502, 503, 504])
+
 
 def build_session(
     *,
@@ -207,9 +310,14 @@ def build_session(
     session = requests.Session()
 
     if use_tls_adapter:
-        retry = Retry(total=max_retries, backoff_factor=1,
-                      status_forcelist=[502, 503, 504])
-        adapter = _TLSAdapter(max_retries=retry)
+        # Retry 不可变, 默认档共用一个实例, 免得每个 Session 都重建
+        retry = (_DEFAULT_RETRY if max_retries == 3
+                 else Retry(total=max_retries, backoff_factor=1,
+                            status_forcelist=[502, 503, 504]))
+        # 连接池放大: 配合 get_session 的缓存复用, 并发线程
+        # 各自拿现成 socket 而不是重新握手
+        adapter = _TLSAdapter(max_retries=retry,
+                              pool_connections=8, pool_maxsize=32)
         session.mount("https://", adapter)
         session.mount("http://", adapter)
 
@@ -228,6 +336,40 @@ def build_session(
     return session
 
 
+# 参数组合 → Session 的进程级缓存: 同一站点的连续 fetch_page
+# 走 keep-alive 长连接, 不再每次新建 Session 重做 TCP+TLS 握手
+_session_cache: Dict[tuple, requests.Session] = {}
+_session_lock = threading.Lock()
+
+
+def get_session(
+    *,
+    user_agent: str = DEFAULT_UA,
+    referer: str = "",
+    cookies: Optional[dict] = None,
+    proxy: Optional[str] = None,
+    use_tls_adapter: bool = True,
+    max_retries: int = 3,
+) -> requests.Session:
+    """build_session 的缓存版本 — 相同参数组合复用同一个 Session"""
+    # 先把 "跟随全局代理" 解析成具体值, 全局代理变了缓存自然分开
+    p = proxy if proxy is not None else _proxy
+    key = (user_agent, referer, p, use_tls_adapter, max_retries,
+           frozenset(cookies.items()) if cookies else None)
+    sess = _session_cache.get(key)
+    if sess is None:
+        with _session_lock:
+            sess = _session_cache.get(key)
+            if sess is None:
+                sess = build_session(
+                    user_agent=user_agent, referer=referer, cookies=cookies,
+                    proxy=p if p is not None else "__none__",
+                    use_tls_adapter=use_tls_adapter, max_retries=max_retries,
+                )
+                _session_cache[key] = sess
+    return sess
+
+
 def fetch_page(url: str, **session_kwargs) -> bytes:
     """
     获取页面内容 (带 SSL 容错、重试、DoH DNS 防污染)
@@ -236,7 +378,7 @@ def fetch_page(url: str, **session_kwargs) -> bytes:
     """
     from urllib.parse import urlparse
 
-    session = build_session(**session_kwargs)
+    session = get_session(**session_kwargs)
 
     # 先尝试直接请求
     try:
@@ -269,10 +411,111 @@ def fetch_page(url: str, **session_kwargs) -> bytes:
     return resp.content
 
 
+# ══════════════════════════════════════════════════════════════
+# 批量抓取 — aiohttp 并发 (可选依赖, 与 download_async 同模式)
+# ══════════════════════════════════════════════════════════════
+
+try:
+    import aiohttp
+    _HAS_AIOHTTP = True
+except ImportError:
+    _HAS_AIOHTTP = False
+
+
+async def fetch_many(
+    urls: List[str],
+    *,
+    concurrency: int = 16,
+    user_agent: str = DEFAULT_UA,
+    proxy: Optional[str] = None,
+    headers: Optional[dict] = None,
+) -> list:
+    """
+    并发抓取一批 URL, N 个页面耗时 ≈ 最慢的一个而不是逐个累加
+
+    返回与输入同序的列表, 每项是 bytes 或抓取时抛出的异常对象。
+    """
+    import asyncio
+
+    connector = aiohttp.TCPConnector(
+        limit=concurrency, ssl=False, ttl_dns_cache=300)
+    sem = asyncio.Semaphore(concurrency)
+    merged = {"User-Agent": user_agent}
+    if headers:
+        merged.update(headers)
+    p = proxy if proxy is not None else _proxy
+
+    async with aiohttp.ClientSession(
+            connector=connector, headers=merged) as session:
+        async def _one(u: str) -> bytes:
+            async with sem:
+                kwargs = {"timeout": aiohttp.ClientTimeout(total=30)}
+                if p and p != "__none__":
+                    kwargs["proxy"] = p
+                async with session.get(u, **kwargs) as resp:
+                    resp.raise_for_status()
+                    return await resp.read()
+
+        return await asyncio.gather(
+            *(_one(u) for u in urls), return_exceptions=True)
+
+
+def fetch_many_sync(urls: List[str], **kw) -> list:
+    """fetch_many 的同步封装, 方便现有同步调用方直接使用
+
+    aiohttp 未安装时退回线程池版本 (fetch_pages_threaded)。
+    """
+    if not _HAS_AIOHTTP:
+        return fetch_pages_threaded(urls, **kw)
+    import asyncio
+    return asyncio.run(fetch_many(urls, **kw))
+
+
+# 批量抓取共用的线程池 — 线程按需创建, 空池本身几乎无开销
+_fetch_pool = ThreadPoolExecutor(max_workers=16,
+                                 thread_name_prefix="fetch")
+atexit.register(_fetch_pool.shutdown, wait=False)
+
+
+def fetch_pages_threaded(
+    urls: List[str],
+    *,
+    concurrency: int = 16,
+    headers: Optional[dict] = None,
+    **session_kwargs,
+) -> list:
+    """
+    线程池版批量抓取 — 纯 requests 栈, 不依赖 aiohttp
+
+    共享缓存 Session (keep-alive + 连接池), I/O 等待期间 GIL 释放,
+    N 个页面的耗时接近最慢的一个。返回与输入同序的列表,
+    失败项为异常对象 (与 fetch_many 一致)。
+    """
+    sess = get_session(**session_kwargs)
+
+    def _one(u: str):
+        try:
+            resp = sess.get(u, headers=headers, timeout=30, verify=False)
+            resp.raise_for_status()
+            return resp.content
+        except Exception as e:
+            return e
+
+    return list(_fetch_pool.map(_one, urls))
+
+
 # ══════════════════════════════════════════════════════════════
 # Clash API 集成 — 自动轮换代理节点
 # ══════════════════════════════════════════════════════════════
 
+# Clash 配置里只关心这两个键, 一次 C 级扫描拿完,
+# 不用整文件 splitlines + 逐行 strip/startswith
+_CLASH_KEY_RE = re.compile(
+    rb"^[ \t]*(external-controller|secret):[ \t]*([^\r\n]+?)[ \t]*$",
+    re.MULTILINE,
+)
+
+
 class ClashRotator:
     """通过 Clash External Controller API 自动轮换代理节点"""
 
@@ -287,6 +530,13 @@ class ClashRotator:
         self._headers: dict = {"Content-Type": "application/json"}
         if secret:
             self._headers["Authorization"] = f"Bearer {secret}"
+        # 专用 Session: 头预置 + keep-alive; trust_env=False 免得
+        # 每次请求都去查环境变量代理 (回环地址的 API 不该走代理)
+        self._sess = requests.Session()
+        self._sess.trust_env = False
+        self._sess.headers.update(self._headers)
+        self._sess.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
     # ── 检测 ──
 
@@ -295,9 +545,12 @@ class ClashRotator:
         self._try_read_clash_config()
         if self.api_url and self._ping(self.api_url):
             return True
-        for port in self.COMMON_PORTS:
-            url = f"http://127.0.0.1:{port}"
-            if self._ping(url):
+        # 常见端口并行 ping — 串行时没装 Clash 要白等 3 个超时
+        urls = [f"http://127.0.0.1:{p}" for p in self.COMMON_PORTS]
+        with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+            results = list(pool.map(self._ping, urls))
+        for url, ok in zip(urls, results):
+            if ok:
                 self.api_url = url
                 return True
         return False
@@ -314,19 +567,17 @@ class ClashRotator:
             config_file = os.path.join(config_dir, "config.yaml")
             if os.path.isfile(config_file):
                 try:
-                    with open(config_file, "r", encoding="utf-8") as f:
+                    with open(config_file, "rb") as f:
                         content = f.read()
-                    for line in content.splitlines():
-                        line = line.strip()
-                        if line.startswith("external-controller:"):
-                            addr = line.split(":", 1)[1].strip()
-                            if addr and not self.api_url:
-                                self.api_url = f"http://{addr}"
-                        if line.startswith("secret:"):
-                            val = line.split(":", 1)[1].strip()
-                            if val and not self.secret:
-                                self.secret = val
-                                self._headers["Authorization"] = f"Bearer {val}"
+                    for m in _CLASH_KEY_RE.finditer(content):
+                        val = m.group(2).decode("utf-8", "replace")
+                        if m.group(1) == b"external-controller":
+                            if val and not self.api_url:
+                                self.api_url = f"http://{val}"
+                        elif val and not self.secret:
+                            self.secret = val
+                            self._headers["Authorization"] = f"Bearer {val}"
+                            self._sess.headers["Authorization"] = f"Bearer {val}"
                     if self.api_url:
                         break
                 except Exception:
@@ -334,9 +585,7 @@ class ClashRotator:
 
     def _ping(self, url: str) -> bool:
         try:
-            resp = requests.get(
-                f"{url}/version", headers=self._headers, timeout=2
-            )
+            resp = self._sess.get(f"{url}/version", timeout=2)
             return resp.status_code == 200
         except Exception:
             return False
@@ -348,11 +597,9 @@ class ClashRotator:
         if not self.api_url:
             return []
         try:
-            resp = requests.get(
-                f"{self.api_url}/proxies",
-                headers=self._headers, timeout=5,
-            )
-            data = resp.json()
+            resp = self._sess.get(f"{self.api_url}/proxies", timeout=5)
+            # 节点多的用户 /proxies 响应能到上百 KB, orjson 明显更快
+            data = _json_loads(resp.content)
             proxies = data.get("proxies", {})
 
             group_types = {"Selector", "URLTest", "Fallback", "LoadBalance", "Relay"}
@@ -388,6 +635,44 @@ class ClashRotator:
         except Exception:
             return []
 
+    # 节点列表磁盘缓存: 每次"检测代理"/下载启动都会重新拉节点,
+    # 5 分钟内直接用上次的结果, 省掉对本地 Clash API 的 HTTP 往返
+    _NODE_CACHE = os.path.join(
+        os.path.expanduser("~"), ".ting13_clash_nodes.json")
+    _NODE_CACHE_TTL = 300  # 秒
+
+    def load_nodes_cached(self) -> List[str]:
+        """load_nodes 的缓存版本: 缓存新鲜时从磁盘热启动节点列表"""
+        try:
+            if (time.time() - os.path.getmtime(self._NODE_CACHE)
+                    < self._NODE_CACHE_TTL):
+                with open(self._NODE_CACHE, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                # 按 API 地址校验, 换了 Clash 实例缓存即失效
+                if data.get("api_url") == self.api_url and data.get("nodes"):
+                    self.group_name = data.get("group_name")
+                    self.nodes = data["nodes"]
+                    self.current_idx = data.get("current_idx", 0)
+                    return self.nodes
+        except (OSError, ValueError):
+            pass
+
+        nodes = self.load_nodes()
+        if nodes:
+            try:
+                tmp = self._NODE_CACHE + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "api_url": self.api_url,
+                        "group_name": self.group_name,
+                        "nodes": self.nodes,
+                        "current_idx": self.current_idx,
+                    }, f, ensure_ascii=False)
+                os.replace(tmp, self._NODE_CACHE)
+            except OSError:
+                pass
+        return nodes
+
     # ── 切换 ──
 
     def rotate(self) -> Optional[str]:
@@ -398,10 +683,9 @@ class ClashRotator:
         node_name = self.nodes[self.current_idx]
         try:
             encoded_group = quote(self.group_name, safe="")
-            resp = requests.put(
+            resp = self._sess.put(
                 f"{self.api_url}/proxies/{encoded_group}",
-                json={"name": node_name},
-                headers=self._headers, timeout=5,
+                json={"name": node_name}, timeout=5,
             )
             if resp.status_code in (200, 204):
                 return node_name
@@ -2,9 +2,9 @@
 通用工具函数
 """
 
+import functools
 import io
 import os
-import re
 import sys
 from typing import Optional
 
@@ -13,10 +13,14 @@ from typing import Optional
 # 文件名处理
 # ══════════════════════════════════════════════════════════════
 
+# Windows 非法字符 → "_" 的映射表; str.translate 是单次 C 级遍历,
+# 比每次调用都跑一遍正则替换快得多 (每章标题都要过一次)
+_SANITIZE_TABLE = str.maketrans({c: "_" for c in '<>:"/\\|?*\0'})
+
+
 def sanitize_filename(name: str) -> str:
     """清理文件名中的非法字符 (Windows 兼容)"""
-    name = re.sub(r'[<>:"/\\|?*]', '_', name)
-    name = name.strip('. ')
+    name = name.translate(_SANITIZE_TABLE).strip('. ')
     return name or "untitled"
 
 
@@ -52,8 +56,9 @@ def setup_playwright_env():
         os.environ["PLAYWRIGHT_DRIVER_PATH"] = driver_path
 
 
+@functools.lru_cache(maxsize=1)
 def get_chrome_exe_path() -> Optional[str]:
-    """获取打包内嵌的 Chromium 可执行文件路径"""
+    """获取打包内嵌的 Chromium 可执行文件路径 (结果缓存, 免重复探测文件系统)"""
     if not is_frozen():
         return None
     base = get_bundled_base()
@@ -42,6 +42,13 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple, Dict
 
+# orjson 解析/序列化比 stdlib 快数倍 (可选, 没装就退回 json)
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 # 修复 Windows 控制台编码问题
 if sys.platform == "win32":
     if hasattr(sys.stdout, "buffer") and getattr(sys.stdout, "encoding", "").lower() != "utf-8":
@@ -87,13 +94,17 @@ def _setup_playwright_env():
 _setup_playwright_env()
 
 
-try:
-    from playwright.sync_api import sync_playwright, Page, Browser
-except ImportError:
-    print("错误: 请先安装 playwright")
-    print("  pip install playwright")
-    print("  playwright install chromium")
-    sys.exit(1)
+# playwright 体积大 (几十 MB), 本模块还被 GUI / worker 当工具库 import,
+# 延迟到真正要开浏览器时再加载
+def _load_sync_playwright():
+    try:
+        from playwright.sync_api import sync_playwright
+        return sync_playwright
+    except ImportError:
+        print("错误: 请先安装 playwright")
+        print("  pip install playwright")
+        print("  playwright install chromium")
+        sys.exit(1)
 
 try:
     import lxml.html
@@ -151,39 +162,47 @@ class _TLSAdapter(HTTPAdapter):
 # ── Cookie 管理（登录状态保持） ───────────────────────────
 
 _cookies_store: List[dict] = []
+_cookies_loaded = False  # 空 jar 也算已加载, 避免每次调用都 stat 文件
 _COOKIE_FILE = os.path.join(os.path.expanduser("~"), ".ting13_cookies.json")
 
 
 def save_cookies(cookies: List[dict]):
     """保存 cookies（Playwright 格式列表）"""
-    global _cookies_store
+    global _cookies_store, _cookies_loaded
     _cookies_store = cookies
+    _cookies_loaded = True
     try:
-        with open(_COOKIE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cookies, f, ensure_ascii=False, indent=2)
+        if _HAS_ORJSON:
+            with open(_COOKIE_FILE, "wb") as f:
+                f.write(orjson.dumps(cookies, option=orjson.OPT_INDENT_2))
+        else:
+            with open(_COOKIE_FILE, "w", encoding="utf-8") as f:
+                json.dump(cookies, f, ensure_ascii=False, indent=2)
     except Exception:
         pass
 
 
 def load_cookies() -> List[dict]:
-    """从文件加载 cookies"""
-    global _cookies_store
-    if _cookies_store:
+    """从文件加载 cookies（进程内只读一次磁盘）"""
+    global _cookies_store, _cookies_loaded
+    if _cookies_loaded:
         return _cookies_store
+    _cookies_loaded = True
     try:
         if os.path.isfile(_COOKIE_FILE):
-            with open(_COOKIE_FILE, "r", encoding="utf-8") as f:
-                _cookies_store = json.load(f)
-                return _cookies_store
+            with open(_COOKIE_FILE, "rb") as f:
+                raw = f.read()
+            _cookies_store = orjson.loads(raw) if _HAS_ORJSON else json.loads(raw)
     except Exception:
         pass
-    return []
+    return _cookies_store
 
 
 def clear_cookies():
     """清除已保存的 cookies"""
-    global _cookies_store
+    global _cookies_store, _cookies_loaded
     _cookies_store = []
+    _cookies_loaded = True
     try:
         if os.path.isfile(_COOKIE_FILE):
             os.remove(_COOKIE_FILE)
@@ -462,8 +481,12 @@ class ClashRotator:
 def _build_session() -> requests.Session:
     """构建带重试、TLS 容错、cookies 和代理的 Session"""
     session = requests.Session()
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[502, 503, 504])
-    adapter = _TLSAdapter(max_retries=retry)
+    retry = Retry(total=3, backoff_factor=1,
+                  status_forcelist=[429, 500, 502, 503, 504])
+    # 加大连接池: 整本书跨章节复用同一批 keep-alive 连接,
+    # 每章省一次 TCP/TLS 握手 (小文件下载是延迟敏感型负载)
+    adapter = _TLSAdapter(max_retries=retry,
+                          pool_connections=16, pool_maxsize=64)
     session.mount("https://", adapter)
     session.mount("http://", adapter)
     # 注入 cookies
@@ -890,7 +913,7 @@ def extract_audio_url_fast(play_url: str, session: "Optional[requests.Session]"
     return None
 
 
-def extract_audio_url(page: Page, play_url: str, timeout: int = 30) -> Optional[str]:
+def extract_audio_url(page: "Page", play_url: str, timeout: int = 30) -> Optional[str]:
     """
     使用 Playwright 打开播放页面，截获音频 URL
 
@@ -1247,21 +1270,19 @@ def download_book(
     fail_count = 0
     consecutive_fails = 0
 
+    sync_playwright = _load_sync_playwright()
     with sync_playwright() as pw:
         print("\n[*] 启动浏览器...")
 
-        # 打包模式下，显式指定 Chromium 可执行文件路径
+        # 打包模式下，显式指定 Chromium 可执行文件路径（结果有缓存）
         launch_kwargs: Dict = {"headless": headless}
-        if _is_frozen():
-            base = _get_bundled_base()
-            chrome_exe = os.path.join(
-                base, "ms-playwright", "chromium-1208", "chrome-win64", "chrome.exe"
-            )
-            if os.path.isfile(chrome_exe):
-                launch_kwargs["executable_path"] = chrome_exe
-                print(f"  [*] 使用内嵌浏览器: {chrome_exe}")
-            else:
-                print(f"  [!] 警告: 未找到内嵌浏览器，尝试使用系统默认...")
+        from ting13.core.utils import get_chrome_exe_path
+        chrome_exe = get_chrome_exe_path()
+        if chrome_exe:
+            launch_kwargs["executable_path"] = chrome_exe
+            print(f"  [*] 使用内嵌浏览器: {chrome_exe}")
+        elif _is_frozen():
+            print(f"  [!] 警告: 未找到内嵌浏览器，尝试使用系统默认...")
 
         if _proxy:
             launch_kwargs["proxy"] = {"server": _proxy}
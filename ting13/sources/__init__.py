@@ -8,8 +8,9 @@ sources — 有声书站点插件注册表
   3. 在下方 get_source_classes() 中注册
 """
 
+import functools
 import re
-from typing import List, Optional, Type
+from typing import List, Optional, Tuple, Type
 
 from .base import Source
 from .ting13 import Ting13Source
@@ -24,22 +25,33 @@ def get_source_classes() -> List[Type[Source]]:
     ]
 
 
+@functools.lru_cache(maxsize=None)
+def _compiled_match(source_cls: Type[Source]) -> Tuple[re.Pattern, ...]:
+    """缓存每个 Source 类编译后的 URL 匹配正则"""
+    return tuple(re.compile(p, re.IGNORECASE) for p in source_cls.match)
+
+
+@functools.lru_cache(maxsize=256)
 def find_source(url: str) -> Optional[Source]:
     """
     根据 URL 匹配找到兼容的 Source 实例
 
+    结果按 URL 缓存: 同一 URL 重复解析/下载时复用同一个实例,
+    避免每次点击都重新跑一遍正则扫描。
+
     Returns:
         匹配的 Source 实例, 无匹配则返回 None
     """
     for source_cls in get_source_classes():
-        for pattern in source_cls.match:
-            if re.search(pattern, url, re.IGNORECASE):
+        for pattern in _compiled_match(source_cls):
+            if pattern.search(url):
                 return source_cls()
     return None
 
 
+@functools.lru_cache(maxsize=1)
 def get_source_names() -> List[str]:
-    """返回所有支持的站点名称"""
+    """返回所有支持的站点名称 (注册表固定, 结果缓存)"""
     names = []
     for cls in get_source_classes():
         names.extend(cls.names)
@@ -8,6 +8,7 @@ Source 基类 — 所有有声书站点插件的抽象接口
   - 生命周期钩子 (before_download / after_download)
 """
 
+import re
 from abc import ABC, abstractmethod
 from typing import List, Optional, TYPE_CHECKING
 
@@ -35,6 +36,14 @@ class Source(ABC):
     names: List[str] = []       # 站点名称列表
     base_url: str = ""          # 站点基础 URL (用于 Referer)
 
+    # URL 类型识别正则 (类级预编译, 子类覆盖; None 表示该类型不存在)
+    PLAY_URL_RE: Optional[re.Pattern] = None
+    BOOK_URL_RE: Optional[re.Pattern] = None
+
+    # 登录会话 cookie 名集合 (支持登录的站点覆盖;
+    # 登录检测用集合交集判断, 与浏览器积累多少 cookie 无关)
+    SESSION_COOKIE_NAMES: frozenset = frozenset()
+
     @property
     def name(self) -> str:
         """主名称"""
@@ -42,15 +51,27 @@ class Source(ABC):
 
     # ── 核心方法 (子类必须实现) ──
 
-    @abstractmethod
     def detect_url_type(self, url: str) -> str:
         """
-        识别 URL 类型
+        识别 URL 类型 (默认用类级正则匹配, 子类通常只需声明正则)
+
+        同一个 URL 会被 GUI 连续问两次 (解析 + 下载兜底),
+        所以实例上缓存最近一次的结果。
 
         Returns:
             'book' (书籍页面), 'play' (播放页面), 或 'unknown'
         """
-        ...
+        cached = getattr(self, "_url_type_cache", None)
+        if cached is not None and cached[0] == url:
+            return cached[1]
+        if self.PLAY_URL_RE is not None and self.PLAY_URL_RE.search(url):
+            result = "play"
+        elif self.BOOK_URL_RE is not None and self.BOOK_URL_RE.search(url):
+            result = "book"
+        else:
+            result = "unknown"
+        self._url_type_cache = (url, result)
+        return result
 
     @abstractmethod
     def parse_book(self, url: str) -> BookInfo:
@@ -14,6 +14,7 @@ huanting.cc (ting22.com) 有声小说源
 import base64
 import hashlib
 import json
+import os
 import re
 import time
 import threading
@@ -43,14 +44,6 @@ try:
 except ImportError:
     _HAS_CV2 = False
 
-# Playwright (可选, 用于验证码后提取)
-try:
-    from playwright.sync_api import sync_playwright, Page
-    _HAS_PLAYWRIGHT = True
-except ImportError:
-    _HAS_PLAYWRIGHT = False
-
-
 # ══════════════════════════════════════════════════════════════
 # 常量
 # ══════════════════════════════════════════════════════════════
@@ -77,9 +70,15 @@ class HuantingSource(Source):
     names = ["ting22.com", "huanting.cc"]
     base_url = "https://www.huanting.cc"
 
+    PLAY_URL_RE = re.compile(r"/ting/")
+    BOOK_URL_RE = re.compile(r"/book/")
+
     # 验证码 cookie 有效次数 (每次 API 调用消耗 1 次, 到阈值时提前刷新)
     _COOKIE_REFRESH_THRESHOLD = 15
 
+    # 章节分页并行抓取线程数
+    PARSE_WORKERS = int(os.environ.get("TING_PARSE_WORKERS", "8"))
+
     def __init__(self):
         self._book_id: Optional[str] = None
         self._captcha_cookies: Optional[Dict[str, str]] = None  # 验证码 cookies 缓存
@@ -91,16 +90,6 @@ class HuantingSource(Source):
         """设置 Clash 节点轮换器 (用于验证码解算时切换 IP)"""
         self._clash_rotator = rotator
 
-    # ── URL 识别 ──
-
-    def detect_url_type(self, url: str) -> str:
-        path = urlparse(url).path
-        if "/book/" in path:
-            return "book"
-        if "/ting/" in path:
-            return "play"
-        return "unknown"
-
     # ── 书籍解析 ──
 
     def parse_book(self, url: str) -> BookInfo:
@@ -164,20 +153,35 @@ class HuantingSource(Source):
         all_raw = parse_chapter_list(tree)
 
         if total_pages > 1:
-            print(f"  [*] 解析分页: 共 {total_pages} 页...")
+            print(f"  [*] 解析分页: 共 {total_pages} 页 (并行获取)...")
 
-        for p in range(2, total_pages + 1):
-            page_url = f"{BASE}/book/{book_id}.html?p={p}"
-            try:
-                time.sleep(0.15)  # 缩短延迟 (0.3 → 0.15s)
+            # 分页获取是纯 I/O, 用线程池并行抓取, 按页号重组保持章节顺序
+            def fetch_page_items(p: int):
+                page_url = f"{BASE}/book/{book_id}.html?p={p}"
                 r = session.get(page_url, timeout=15)
                 r.encoding = "utf-8"
-                new_items = parse_chapter_list(lxml_html.fromstring(r.text))
-                all_raw.extend(new_items)
-                if p % 5 == 0 or p == total_pages:
-                    print(f"  [*] 已解析 {p}/{total_pages} 页 ({len(all_raw)} 章)")
-            except Exception as e:
-                print(f"  [!] 第 {p} 页解析失败: {e}")
+                return parse_chapter_list(lxml_html.fromstring(r.text))
+
+            page_items: Dict[int, list] = {}
+            workers = min(self.PARSE_WORKERS, total_pages - 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = {
+                    pool.submit(fetch_page_items, p): p
+                    for p in range(2, total_pages + 1)
+                }
+                done = 0
+                for future in as_completed(futures):
+                    p = futures[future]
+                    try:
+                        page_items[p] = future.result()
+                    except Exception as e:
+                        print(f"  [!] 第 {p} 页解析失败: {e}")
+                    done += 1
+                    if done % 5 == 0 or done == total_pages - 1:
+                        print(f"  [*] 已解析 {done + 1}/{total_pages} 页")
+
+            for p in sorted(page_items):
+                all_raw.extend(page_items[p])
 
         chapters = [
             Chapter(index=i, title=t, play_url=href)
@@ -11,22 +11,49 @@ ting13.cc 有声小说源
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
 import lxml.html
+from lxml.cssselect import CSSSelector
 
 from .base import Source
 from ting13.core.models import BookInfo, Chapter
 from ting13.core.network import build_session, fetch_page, get_proxy, MOBILE_UA, DEFAULT_UA
 from ting13.core.utils import is_frozen, get_bundled_base, get_chrome_exe_path
 
-# Playwright 延迟导入 (仅在需要时)
-_playwright_available = True
-try:
-    from playwright.sync_api import sync_playwright, Page
-except ImportError:
-    _playwright_available = False
+# Playwright 延迟导入 — 首次 before_download 时才真正 import,
+# 避免 GUI/CLI 冷启动就加载几十 MB 的 playwright 包
+_sync_playwright = None
+
+
+def _load_playwright():
+    global _sync_playwright
+    if _sync_playwright is None:
+        try:
+            from playwright.sync_api import sync_playwright
+            _sync_playwright = sync_playwright
+        except ImportError:
+            _sync_playwright = False
+    return _sync_playwright or None
+
+
+# ══════════════════════════════════════════════════════════════
+# 预编译 CSS 选择器 — 避免每次解析页面都重新编译选择器字符串
+# ══════════════════════════════════════════════════════════════
+
+_SEL_H1 = CSSSelector("h1")
+_SEL_TITLE_CLS = CSSSelector(".title")
+_SEL_TITLE_TAG = CSSSelector("title")
+_SEL_AUTHOR = CSSSelector(".author")
+_SEL_OG_ARTIST = CSSSelector("meta[property='og:music:artist']")
+_SEL_COVER_IMG = CSSSelector("img.cover")
+_SEL_BOOKCOVER_IMG = CSSSelector(".bookcover img")
+_SEL_OG_IMAGE = CSSSelector("meta[property='og:image']")
+_SEL_PLAY_LINKS = CSSSelector("a[href*='/play/']")
+_SEL_TINGDIRS_LINKS = CSSSelector("a[href*='/tingdirs/']")
+_SEL_ALL_LINKS = CSSSelector("a")
 
 
 # ══════════════════════════════════════════════════════════════
@@ -133,6 +160,12 @@ class Ting13Source(Source):
     names = ["ting13.cc"]
     base_url = "https://www.ting13.cc"
 
+    PLAY_URL_RE = re.compile(r"/play/")
+    BOOK_URL_RE = re.compile(r"/youshengxiaoshuo/|/book/")
+
+    SESSION_COOKIE_NAMES = frozenset({
+        "PHPSESSID", "user_token", "token", "uid"})
+
     def __init__(self):
         self._browser = None
         self._context = None
@@ -145,15 +178,6 @@ class Ting13Source(Source):
     def set_headless(self, headless: bool):
         self._headless = headless
 
-    # ── URL 识别 ──
-
-    def detect_url_type(self, url: str) -> str:
-        if "/play/" in url:
-            return "play"
-        elif "/youshengxiaoshuo/" in url or "/book/" in url:
-            return "book"
-        return "unknown"
-
     # ── 页面解析 ──
 
     def parse_book(self, url: str) -> BookInfo:
@@ -163,14 +187,14 @@ class Ting13Source(Source):
 
         # 书名
         title = "未知书名"
-        title_elems = tree.cssselect("h1") or tree.cssselect(".title") or tree.cssselect("title")
+        title_elems = _SEL_H1(tree) or _SEL_TITLE_CLS(tree) or _SEL_TITLE_TAG(tree)
         if title_elems:
             title = title_elems[0].text_content().strip()
             title = re.sub(r'\s*(有声小说|在线收听|全集).*$', '', title)
 
         # 作者
         author = "未知作者"
-        author_elems = tree.cssselect(".author") or tree.cssselect("meta[property='og:music:artist']")
+        author_elems = _SEL_AUTHOR(tree) or _SEL_OG_ARTIST(tree)
         if author_elems:
             if author_elems[0].tag == "meta":
                 author = author_elems[0].get("content", "未知作者")
@@ -179,7 +203,7 @@ class Ting13Source(Source):
 
         # 封面
         cover_url = ""
-        cover_elems = tree.cssselect("img.cover") or tree.cssselect(".bookcover img") or tree.cssselect("meta[property='og:image']")
+        cover_elems = _SEL_COVER_IMG(tree) or _SEL_BOOKCOVER_IMG(tree) or _SEL_OG_IMAGE(tree)
         if cover_elems:
             if cover_elems[0].tag == "meta":
                 cover_url = cover_elems[0].get("content", "")
@@ -192,7 +216,7 @@ class Ting13Source(Source):
         if tingdirs_url:
             chapters = self._fetch_all_chapters(tingdirs_url, desktop_url)
         else:
-            play_links = tree.cssselect("a[href*='/play/']")
+            play_links = _SEL_PLAY_LINKS(tree)
             chapters = self._extract_chapters_from_links(play_links, desktop_url)
 
         return BookInfo(
@@ -296,7 +320,8 @@ class Ting13Source(Source):
 
     def before_download(self, chapters, callbacks):
         """启动 Playwright 浏览器"""
-        if not _playwright_available:
+        sync_playwright = _load_playwright()
+        if sync_playwright is None:
             callbacks.on_log("[FAIL] Playwright 未安装, 无法下载 ting13.cc")
             return
 
@@ -359,11 +384,11 @@ class Ting13Source(Source):
     # ── 内部方法: 章节列表解析 ──
 
     def _find_tingdirs_url(self, tree, base_url: str) -> Optional[str]:
-        for link in tree.cssselect("a[href*='/tingdirs/']"):
+        for link in _SEL_TINGDIRS_LINKS(tree):
             text = link.text_content().strip()
             if "章节" in text or "目录" in text:
                 return urljoin(base_url, link.get("href", ""))
-        for link in tree.cssselect("a"):
+        for link in _SEL_ALL_LINKS(tree):
             text = link.text_content().strip()
             href = link.get("href", "")
             if ("全部章节" in text or "更多章节" in text) and href:
@@ -371,11 +396,11 @@ class Ting13Source(Source):
                 try:
                     content = fetch_page(bookdir_url, referer=self.base_url + "/")
                     bookdir_tree = lxml.html.fromstring(content)
-                    for sublink in bookdir_tree.cssselect("a[href*='/tingdirs/']"):
+                    for sublink in _SEL_TINGDIRS_LINKS(bookdir_tree):
                         subtext = sublink.text_content().strip()
                         if "目录" in subtext or "章节" in subtext:
                             return urljoin(base_url, sublink.get("href", ""))
-                    for sublink in bookdir_tree.cssselect("a"):
+                    for sublink in _SEL_ALL_LINKS(bookdir_tree):
                         subhref = sublink.get("href", "")
                         if "page=" in subhref and "sort=" in subhref:
                             return bookdir_url
@@ -391,7 +416,7 @@ class Ting13Source(Source):
         tree = lxml.html.fromstring(content)
 
         page_urls = []
-        for link in tree.cssselect("a"):
+        for link in _SEL_ALL_LINKS(tree):
             href = link.get("href", "")
             if "page=" in href and "sort=" in href:
                 full_href = urljoin(base_url, href)
@@ -407,27 +432,34 @@ class Ting13Source(Source):
             if re.search(r'page=(\d+)', u) else 0
         )
 
-        for page_idx, page_url in enumerate(page_urls):
-            try:
-                content = fetch_page(page_url, referer=self.base_url + "/")
-                tree = lxml.html.fromstring(content)
-                play_links = tree.cssselect("a[href*='/play/']")
-
-                for link in play_links:
-                    href = link.get("href", "")
-                    if not href or href in seen_urls:
-                        continue
-                    seen_urls.add(href)
-                    title = link.text_content().strip()
-                    if title in ["立即收听", ""]:
-                        continue
-                    full_url = urljoin(base_url, href).replace("m.ting13.cc", "www.ting13.cc")
-                    all_chapters.append(Chapter(
-                        index=len(all_chapters) + 1,
-                        title=title, play_url=full_url,
-                    ))
-            except Exception:
-                pass
+        # 并行抓取各分页 (纯 I/O), 再按页序提取, 保证章节编号稳定
+        page_trees: Dict[int, "lxml.html.HtmlElement"] = {}
+        with ThreadPoolExecutor(max_workers=min(8, len(page_urls))) as pool:
+            futures = {
+                pool.submit(fetch_page, page_url, referer=self.base_url + "/"): idx
+                for idx, page_url in enumerate(page_urls)
+            }
+            for future in as_completed(futures):
+                try:
+                    page_trees[futures[future]] = lxml.html.fromstring(future.result())
+                except Exception:
+                    pass
+
+        for page_idx in sorted(page_trees):
+            play_links = _SEL_PLAY_LINKS(page_trees[page_idx])
+            for link in play_links:
+                href = link.get("href", "")
+                if not href or href in seen_urls:
+                    continue
+                seen_urls.add(href)
+                title = link.text_content().strip()
+                if title in ["立即收听", ""]:
+                    continue
+                full_url = urljoin(base_url, href).replace("m.ting13.cc", "www.ting13.cc")
+                all_chapters.append(Chapter(
+                    index=len(all_chapters) + 1,
+                    title=title, play_url=full_url,
+                ))
 
         return all_chapters
 
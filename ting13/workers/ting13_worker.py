@@ -9,19 +9,20 @@
 
 import multiprocessing
 import os
+import pickle
 import sys
 import json
 import time
 import random
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
 from typing import Optional, Dict, Any
 
 if __package__ in (None, ""):
     sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from ting13.legacy.ting13_downloader import (
-    _is_frozen,
-    _get_bundled_base,
     Chapter,
     BookInfo,
     fetch_page,
@@ -36,54 +37,166 @@ from ting13.legacy.ting13_downloader import (
     detect_url_type,
     MIN_VALID_FILE_SIZE,
 )
-from playwright.sync_api import sync_playwright
 
 from ting13.core.download import DownloadEngine, DownloadCallbacks
 from ting13.core.network import set_proxy as core_set_proxy
+from ting13.core.utils import get_chrome_exe_path
 from ting13.sources.huanting import HuantingSource
 
 
+class TaggedQueue:
+    """给每条消息加上 tab_id 前缀 — 所有任务共用主进程的一条队列
+
+    N 个标签页各开一条管道意味着 N 个内核管道和 N 份 pickler;
+    共用一条队列后主进程每轮只需一次批量 drain, 按前缀分发给各页签。
+    Manager 队列代理可 pickle, 因此本包装也能直接传给池子进程。
+    """
+    def __init__(self, q, tag: str):
+        self._q = q
+        self._tag = tag
+
+    def put(self, msg):
+        self._q.put((self._tag,) + tuple(msg))
+
+
+class _LogBatcher:
+    """日志批量缓冲：攒满若干条或距上次刷新超时后合并为一条 ("log_batch", lines)
+
+    每条日志单独 put 要走一次 pickle + 管道写，主进程一次 insert 一次重绘；
+    合并后 N 条日志只占一条队列消息、一次 Tk 插入。
+    """
+    MAX_LINES = 32   # 缓冲上限（条）
+    MAX_AGE = 0.05   # 刷新间隔上限（秒）
+
+    def __init__(self, q: multiprocessing.Queue):
+        self._q = q
+        self._buf: list = []
+        self._last_flush = time.monotonic()
+
+    def add(self, line: str):
+        self._buf.append(line)
+        if (len(self._buf) >= self.MAX_LINES
+                or time.monotonic() - self._last_flush >= self.MAX_AGE):
+            self.flush()
+
+    def flush(self):
+        if self._buf:
+            self._q.put(("log_batch", tuple(self._buf)))
+            self._buf.clear()
+        self._last_flush = time.monotonic()
+
+
 class _MsgSender:
     """在子进程中发送消息到 mp Queue"""
     def __init__(self, q: multiprocessing.Queue):
         self._q = q
+        self.batcher = _LogBatcher(q)
     def log(self, msg: str):
-        self._q.put(("log", msg))
+        self.batcher.add(msg)
     def status(self, text: str):
+        # 先刷日志缓冲，保证日志与状态类消息的相对顺序
+        self.batcher.flush()
         self._q.put(("status", text))
     def info(self, text: str):
+        self.batcher.flush()
         self._q.put(("info", text))
     def progress(self, value: float, label: str = ""):
         self._q.put(("progress", value, label))
     def buttons(self, working: bool):
+        self.batcher.flush()
         self._q.put(("buttons", working))
     def rename(self, name: str):
+        self.batcher.flush()
         self._q.put(("rename_tab", name))
+    # 结果超过此大小时改走共享内存 (千章大书的章节表 pickle 很可观)
+    RESULT_SHM_THRESHOLD = 256 * 1024
+
     def result(self, key: str, value: Any):
+        self.batcher.flush()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        # Windows 的共享内存段在最后一个句柄关闭时就销毁 —
+        # 这里 close 后主进程还没 attach, 段已经没了, 所以只在
+        # POSIX 走共享内存, Windows 退回整体 pickle 进队列
+        if (len(blob) >= self.RESULT_SHM_THRESHOLD
+                and sys.platform != "win32"):
+            try:
+                shm = shared_memory.SharedMemory(create=True, size=len(blob))
+                shm.buf[:len(blob)] = blob
+                # 队列里只走 (名字, 长度), 由主进程 attach 后读出并 unlink
+                self._q.put(("result_shm", key, shm.name, len(blob)))
+                shm.close()
+                return
+            except Exception:
+                pass  # 共享内存不可用时退回整体 pickle
         self._q.put(("result", key, value))
     def request_rotate(self, reason: str = ""):
+        self.batcher.flush()
         self._q.put(("rotate_request", reason))
 
 
 class _PrintToQueue:
     """子进程中替换 sys.stdout，将 print 输出发送到队列"""
-    def __init__(self, q: multiprocessing.Queue):
+    def __init__(self, q: multiprocessing.Queue,
+                 batcher: Optional[_LogBatcher] = None):
         self._q = q
+        self._batcher = batcher
         self.encoding = "utf-8"
     def write(self, text: str):
         if text and text.strip():
-            self._q.put(("log", text.rstrip("\n")))
+            line = text.rstrip("\n")
+            if self._batcher is not None:
+                self._batcher.add(line)
+            else:
+                self._q.put(("log", line))
     def flush(self):
-        pass
+        if self._batcher is not None:
+            self._batcher.flush()
+
+
+# ── 进程级浏览器缓存 ─────────────────────────────────────────
+# 池子进程常驻, Chromium 启动 (秒级 + 数百 MB) 每进程只付一次;
+# 各任务用独立 context 隔离 cookie/路由, 任务结束只关 context。
+# 线程安全前提: 池子进程一次只跑一个任务, 且任务都在主线程执行,
+# 因此 sync API "同一实例只能在一个线程用" 的约束天然成立 —
+# 如果以后往 worker 里加线程, 不要跨线程碰这里的对象
+
+_pw_manager = None
+_pw_browser = None
+_pw_launch_key = None
+
+
+def _get_browser(launch_kwargs: Dict):
+    """返回本进程缓存的 Browser; 启动参数变化或连接断开时重启"""
+    global _pw_manager, _pw_browser, _pw_launch_key
+    key = tuple(sorted((k, str(v)) for k, v in launch_kwargs.items()))
+    if _pw_browser is not None and _pw_launch_key == key:
+        try:
+            if _pw_browser.is_connected():
+                return _pw_browser
+        except Exception:
+            pass
+    if _pw_browser is not None:
+        try:
+            _pw_browser.close()
+        except Exception:
+            pass
+        _pw_browser = None
+    if _pw_manager is None:
+        # 延迟导入: 快速 API 模式全程用不到 playwright
+        from playwright.sync_api import sync_playwright
+        _pw_manager = sync_playwright().start()
+    _pw_browser = _pw_manager.chromium.launch(**launch_kwargs)
+    _pw_launch_key = key
+    return _pw_browser
 
 
 def worker_parse(msg_q: multiprocessing.Queue,
                  stop_evt: multiprocessing.Event,
                  url: str, site: str, proxy: str):
     """子进程：解析书籍"""
-    sys.stdout = _PrintToQueue(msg_q)
-    sys.stderr = _PrintToQueue(msg_q)
     s = _MsgSender(msg_q)
+    sys.stdout = _PrintToQueue(msg_q, s.batcher)
+    sys.stderr = _PrintToQueue(msg_q, s.batcher)
     try:
         set_proxy(proxy if proxy else None)
         if site == "huanting":
@@ -144,17 +257,18 @@ def worker_download(msg_q: multiprocessing.Queue,
                     output_dir: str, start: int, end: Optional[int],
                     headless: bool, proxy: str,
                     rotate_enabled: bool, rotate_interval: int,
-                    book_data: Optional[dict]):
+                    book_data: Optional[dict],
+                    concurrency: int = 4):
     """子进程：下载书籍"""
-    sys.stdout = _PrintToQueue(msg_q)
-    sys.stderr = _PrintToQueue(msg_q)
     s = _MsgSender(msg_q)
+    sys.stdout = _PrintToQueue(msg_q, s.batcher)
+    sys.stderr = _PrintToQueue(msg_q, s.batcher)
     set_proxy(proxy if proxy else None)
 
     try:
         if site == "huanting":
             _download_huanting(s, stop_evt, url, output_dir, start, end,
-                               proxy, rotate_interval, book_data)
+                               proxy, rotate_interval, book_data, concurrency)
         else:
             _download_ting13(s, stop_evt, url, url_type, output_dir,
                              start, end, headless, proxy,
@@ -168,7 +282,7 @@ def worker_download(msg_q: multiprocessing.Queue,
 
 
 def _download_huanting(s, stop_evt, url, output_dir, start, end,
-                       proxy, rotate_interval, book_data):
+                       proxy, rotate_interval, book_data, concurrency=4):
     core_set_proxy(proxy if proxy else None)
 
     source = HuantingSource()
@@ -186,6 +300,7 @@ def _download_huanting(s, stop_evt, url, output_dir, start, end,
         callbacks=callbacks,
         clash_rotator=None,
         rotate_interval=rotate_interval,
+        download_workers=concurrency,
     )
 
     if book_data:
@@ -285,7 +400,35 @@ def _download_ting13(s, stop_evt, url, url_type, output_dir, start, end,
     # 复用同一个 Session 以利用 HTTP keep-alive
     shared_session = _build_session()
 
-    pw_manager = None
+    # URL 预取流水线: 下载当前章时后台提取下一章的音频 URL,
+    # 把 API 往返延迟藏进下载时间里 (与 DownloadEngine 的做法一致)
+    prefetch_pool = ThreadPoolExecutor(max_workers=1)
+    prefetch_future = None
+    prefetch_idx = -1
+
+    def _on_disk(ch) -> bool:
+        """章节文件已在磁盘上 (镜像主循环的 {index:04d}_ 前缀检查)"""
+        prefix = f"{ch.index:04d}_"
+        try:
+            return any(f.startswith(prefix) for f in os.listdir(book_dir))
+        except OSError:
+            return False
+
+    def _prefetch_next(idx):
+        nonlocal prefetch_future, prefetch_idx
+        # 跳过磁盘上已有文件的章节 — 断点续传时缺口后面跟着的
+        # 已下载章节不值得浪费一次怕限流的 API 调用
+        while idx < len(chapters) and _on_disk(chapters[idx]):
+            idx += 1
+        if idx < len(chapters):
+            prefetch_future = prefetch_pool.submit(
+                extract_audio_url_fast, chapters[idx].play_url,
+                session=shared_session)
+            prefetch_idx = idx
+        else:
+            prefetch_future = None
+            prefetch_idx = -1
+
     browser = None
     context = None
     page = None
@@ -301,23 +444,18 @@ def _download_ting13(s, stop_evt, url, url_type, output_dir, start, end,
     ]
 
     def _ensure_pw():
-        nonlocal pw_manager, browser, context, page
+        nonlocal browser, context, page
         if page is not None:
             return page
         s.log("[*] API 模式不可用，启动浏览器回退模式...")
         s.status("启动浏览器...")
-        pw_manager = sync_playwright().start()
         launch_kwargs: Dict = {"headless": headless}
-        if _is_frozen():
-            base = _get_bundled_base()
-            chrome_exe = os.path.join(
-                base, "ms-playwright", "chromium-1208", "chrome-win64", "chrome.exe"
-            )
-            if os.path.isfile(chrome_exe):
-                launch_kwargs["executable_path"] = chrome_exe
+        chrome_exe = get_chrome_exe_path()
+        if chrome_exe:
+            launch_kwargs["executable_path"] = chrome_exe
         if proxy:
             launch_kwargs["proxy"] = {"server": proxy}
-        browser = pw_manager.chromium.launch(**launch_kwargs)
+        browser = _get_browser(launch_kwargs)
         stored_cookies = load_cookies()
         if stored_cookies:
             context = browser.new_context(
@@ -448,10 +586,21 @@ def _download_ting13(s, stop_evt, url, url_type, output_dir, start, end,
             audio_url = None
 
             t0 = time.time()
-            try:
-                audio_url = extract_audio_url_fast(chapter.play_url, session=shared_session)
-            except Exception:
-                pass
+            if prefetch_idx == i and prefetch_future is not None:
+                # 上一章下载期间已在后台提取好
+                try:
+                    audio_url = prefetch_future.result(timeout=60)
+                except Exception:
+                    audio_url = None
+                prefetch_future = None
+                prefetch_idx = -1
+            else:
+                try:
+                    audio_url = extract_audio_url_fast(
+                        chapter.play_url, session=shared_session)
+                except Exception:
+                    pass
+            _prefetch_next(i + 1)
 
             if audio_url:
                 api_mode_ok += 1
@@ -628,14 +777,11 @@ def _download_ting13(s, stop_evt, url, url_type, output_dir, start, end,
                     time.sleep(delay)
 
     finally:
-        if browser:
-            try:
-                browser.close()
-            except Exception:
-                pass
-        if pw_manager:
+        prefetch_pool.shutdown(wait=False)
+        # 浏览器进程留给本池子进程下次任务复用, 只收掉本次的 context
+        if context:
             try:
-                pw_manager.stop()
+                context.close()
             except Exception:
                 pass
 